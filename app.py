@@ -1,8 +1,14 @@
 #!/usr/bin/env python3
-"""Unified FastAPI application for job analysis and candidate evaluation."""
+"""Unified FastAPI application for job analysis, candidate evaluation and feedback."""
 
+import asyncio
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
@@ -10,11 +16,69 @@ from pydantic import BaseModel, Field
 
 from src.job_requirements_analyzer import (
     analyze_job_from_url,
+    analyze_jobs,
+    close_session,
     get_project_root,
+    scrape_job_description,
+    warm_up_client,
 )
 from src.candidate_evaluation_runner import run_candidate_evaluation
+from src.candidate_feedback_generator import (
+    FeedbackBatcher,
+    load_feedback_inputs,
+    save_feedback,
+)
+
+# Number of evaluation runs allowed to execute concurrently
+EVALUATION_WORKERS = 2
+
+# Maximum number of job pages scraped at once by /analyze_jobs
+SCRAPE_CONCURRENCY = 10
+
+# Maximum number of URLs accepted by /analyze_jobs; all of them share one LLM prompt
+MAX_JOBS_PER_REQUEST = 20
+
+# Threads available to asyncio.to_thread; the work is I/O bound (scraping, Gemini)
+THREADPOOL_SIZE = 100
+
+# Finished evaluation tasks (with their results) stay pollable for this many
+# seconds, and at most this many are kept; queued and running tasks are never dropped
+FINISHED_TASK_TTL = 3600
+MAX_FINISHED_TASKS = 1000
+
+evaluation_queue: Optional[asyncio.Queue] = None
+evaluation_tasks: Dict[str, dict] = {}
+# Finished task ids, oldest first, with the monotonic time they finished
+finished_tasks: "OrderedDict[str, float]" = OrderedDict()
+
+# Feedback requests are grouped into micro-batches of up to 16, waiting at most 200ms
+feedback_batcher: Optional[FeedbackBatcher] = None
 
-app = FastAPI(title="GlobalAI Recruitment API")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start evaluation and feedback workers, warm the Vertex AI client, release the HTTP pool."""
+    global evaluation_queue, feedback_batcher
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=THREADPOOL_SIZE)
+    )
+    evaluation_queue = asyncio.Queue()
+    workers = [
+        asyncio.create_task(_evaluation_worker())
+        for _ in range(EVALUATION_WORKERS)
+    ]
+    feedback_batcher = FeedbackBatcher(project_root=get_project_root())
+    workers.append(asyncio.create_task(feedback_batcher.run()))
+    await asyncio.to_thread(warm_up_client)
+    try:
+        yield
+    finally:
+        for worker in workers:
+            worker.cancel()
+        close_session()
+
+
+app = FastAPI(title="GlobalAI Recruitment API", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -35,7 +99,7 @@ class AnalyzeJobRequest(BaseModel):
 
 
 @app.post("/analyze_job")
-def analyze_job(request: AnalyzeJobRequest) -> dict:
+async def analyze_job(request: AnalyzeJobRequest) -> dict:
     project_root = get_project_root()
     output_path: Optional[str]
     if request.output_file:
@@ -47,7 +111,8 @@ def analyze_job(request: AnalyzeJobRequest) -> dict:
         output_path = None
 
     try:
-        result = analyze_job_from_url(
+        result = await asyncio.to_thread(
+            analyze_job_from_url,
             url=request.url,
             company=request.company,
             n=request.n,
@@ -63,6 +128,40 @@ def analyze_job(request: AnalyzeJobRequest) -> dict:
         ) from exc
 
 
+class AnalyzeJobsRequest(BaseModel):
+    urls: List[str] = Field(
+        ..., min_length=1, max_length=MAX_JOBS_PER_REQUEST, description="Job posting URLs"
+    )
+    company: str = Field(..., description="Company name")
+    n: int = Field(5, description="Number of features to extract per job")
+
+
+@app.post("/analyze_jobs")
+async def analyze_jobs_endpoint(request: AnalyzeJobsRequest) -> dict:
+    semaphore = asyncio.Semaphore(SCRAPE_CONCURRENCY)
+
+    async def scrape(url: str) -> str:
+        async with semaphore:
+            return await asyncio.to_thread(scrape_job_description, url)
+
+    try:
+        descriptions = await asyncio.gather(*(scrape(url) for url in request.urls))
+        results = await asyncio.to_thread(
+            analyze_jobs,
+            urls=request.urls,
+            job_descriptions=list(descriptions),
+            company=request.company,
+            n=request.n,
+        )
+        return {"results": results}
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    except Exception as exc:  # pragma: no cover
+        raise HTTPException(
+            status_code=500, detail=f"Feature extraction failed: {exc}"
+        ) from exc
+
+
 class CandidateEvaluationRequest(BaseModel):
     job_file: str = Field(
         "data/job_requirements.json",
@@ -80,21 +179,132 @@ class CandidateEvaluationRequest(BaseModel):
     )
 
 
-@app.get("/evaluate_candidates")
-def evaluate_candidates(
-) -> dict:
+# ---------------------------------------------------------------------------
+# Background evaluation tasks
+# ---------------------------------------------------------------------------
+
+def _resolve_path(path_str: str, project_root: Path) -> Path:
+    path = Path(path_str)
+    if not path.is_absolute():
+        path = project_root / path
+    return path
+
+
+def _run_evaluation(request: CandidateEvaluationRequest) -> dict:
+    project_root = get_project_root()
+    return run_candidate_evaluation(
+        job_file=str(_resolve_path(request.job_file, project_root)),
+        candidate_ids=request.candidate_ids,
+        output_dir=str(_resolve_path(request.output_dir, project_root)),
+        show_details=request.show_details,
+        project_root=project_root,
+    )
+
+
+def _prune_finished_tasks() -> None:
+    """Drop finished tasks older than FINISHED_TASK_TTL or beyond MAX_FINISHED_TASKS."""
+    now = time.monotonic()
+    while finished_tasks:
+        task_id, finished_at = next(iter(finished_tasks.items()))
+        if len(finished_tasks) <= MAX_FINISHED_TASKS and now - finished_at < FINISHED_TASK_TTL:
+            break
+        finished_tasks.popitem(last=False)
+        evaluation_tasks.pop(task_id, None)
+
+
+async def _evaluation_worker() -> None:
+    while True:
+        task_id, request = await evaluation_queue.get()
+        task = evaluation_tasks[task_id]
+        task["status"] = "running"
+        try:
+            task["result"] = await asyncio.to_thread(_run_evaluation, request)
+            task["status"] = "completed"
+        except FileNotFoundError as exc:
+            task.update(status="failed", status_code=404, error=str(exc))
+        except ValueError as exc:
+            task.update(status="failed", status_code=400, error=str(exc))
+        except Exception as exc:  # pragma: no cover
+            task.update(
+                status="failed",
+                status_code=500,
+                error=f"Candidate evaluation failed: {exc}",
+            )
+        finally:
+            finished_tasks[task_id] = time.monotonic()
+            _prune_finished_tasks()
+            evaluation_queue.task_done()
+
+
+@app.post("/evaluate_candidates", status_code=202)
+async def evaluate_candidates(request: CandidateEvaluationRequest) -> dict:
+    _prune_finished_tasks()
+    task_id = uuid.uuid4().hex
+    evaluation_tasks[task_id] = {"task_id": task_id, "status": "queued"}
+    await evaluation_queue.put((task_id, request))
+    return {"task_id": task_id, "status": "queued"}
+
+
+@app.get("/tasks/{task_id}")
+async def get_task(task_id: str) -> dict:
+    task = evaluation_tasks.get(task_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail=f"Unknown task: {task_id}")
+    return task
+
+
+class CandidateFeedbackRequest(BaseModel):
+    candidate_id: int = Field(..., description="Candidate ID to generate feedback for")
+    evaluations_file: str = Field(
+        "data/candidate_evaluations.json",
+        description="Path to candidate evaluations JSON (relative to project root)",
+    )
+    requirements_file: str = Field(
+        "data/job_requirements.json",
+        description="Path to job requirements JSON (relative to project root)",
+    )
+    feedback_dir: str = Field(
+        "data/feedback",
+        description="Directory (relative to project root) for per-candidate feedback files",
+    )
+    refresh: bool = Field(
+        False,
+        description="Call the model even if feedback for an identical prompt is memoized",
+    )
+
+
+@app.post("/generate_feedback")
+async def generate_feedback(request: CandidateFeedbackRequest) -> dict:
     project_root = get_project_root()
-    print(project_root)
     try:
-        result = run_candidate_evaluation(
-            project_root=project_root,
+        evaluations_data, job_requirements = await asyncio.to_thread(
+            load_feedback_inputs,
+            _resolve_path(request.evaluations_file, project_root),
+            _resolve_path(request.requirements_file, project_root),
         )
-        return result
+        candidate_eval = evaluations_data.get("candidates", {}).get(str(request.candidate_id))
+        if not candidate_eval:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Candidate {request.candidate_id} not found in evaluation file",
+            )
+        # Concurrent requests are micro-batched into shared LLM dispatches
+        feedback = await feedback_batcher.submit(
+            request.candidate_id, candidate_eval, job_requirements, refresh=request.refresh
+        )
+        feedback_dir = _resolve_path(request.feedback_dir, project_root)
+        feedback_dir.mkdir(parents=True, exist_ok=True)
+        await asyncio.to_thread(
+            save_feedback, {str(request.candidate_id): feedback}, feedback_dir
+        )
+        return feedback.model_dump()
+    except HTTPException:
+        raise
     except FileNotFoundError as exc:
         raise HTTPException(status_code=404, detail=str(exc)) from exc
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
     except Exception as exc:  # pragma: no cover
         raise HTTPException(
-            status_code=500, detail=f"Candidate evaluation failed: {exc}"
+            status_code=500, detail=f"Feedback generation failed: {exc}"
         ) from exc
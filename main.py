@@ -4,7 +4,7 @@
 import argparse
 import sys
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Union
 
 PROJECT_ROOT = Path(__file__).resolve().parent
 SRC_PATH = PROJECT_ROOT / "src"
@@ -13,7 +13,12 @@ if str(SRC_PATH) not in sys.path:
 
 from job_requirements_analyzer import analyze_job_from_url, get_project_root
 from candidate_evaluation_runner import run_candidate_evaluation
-from candidate_feedback_generator import generate_feedback_for_candidate
+from candidate_feedback_generator import generate_feedback_for_candidate, summarize_feedback
+
+
+def _abs(path: Union[str, Path], root: Path) -> Path:
+    path = Path(path)
+    return path if path.is_absolute() else (root / path).resolve()
 
 
 def _as_relative(path: Path, root: Path) -> str:
@@ -68,7 +73,7 @@ def main(argv: Optional[List[str]] = None) -> None:
     args = parse_args(argv)
     project_root = get_project_root()
 
-    output_dir = (project_root / args.output_dir).resolve()
+    output_dir = _abs(args.output_dir, project_root)
     output_dir.mkdir(parents=True, exist_ok=True)
 
     job_requirements_path = output_dir / "job_requirements.json"
@@ -88,9 +93,7 @@ def main(argv: Optional[List[str]] = None) -> None:
     )
     saved_requirements = job_result.get("saved_path")
     if saved_requirements:
-        job_requirements_path = Path(saved_requirements)
-        if not job_requirements_path.is_absolute():
-            job_requirements_path = (project_root / job_requirements_path).resolve()
+        job_requirements_path = _abs(saved_requirements, project_root)
 
     print("\n" + "=" * 80)
     print("AGENT B: Candidate Evaluation")
@@ -103,10 +106,7 @@ def main(argv: Optional[List[str]] = None) -> None:
         project_root=project_root,
     )
 
-    eval_file = Path(evaluation_result["output_file"])
-    if not eval_file.is_absolute():
-        eval_file = (project_root / eval_file).resolve()
-    candidate_evaluations_path = eval_file
+    candidate_evaluations_path = _abs(evaluation_result["output_file"], project_root)
 
     print("\n" + "=" * 80)
     print("AGENT C: Feedback Generation")
@@ -115,10 +115,16 @@ def main(argv: Optional[List[str]] = None) -> None:
         candidate_id=args.candidate_id,
         evaluations_file=candidate_evaluations_path,
         requirements_file=job_requirements_path,
-        output_file=feedback_summary_path,
         feedback_dir=feedback_dir,
         project_root=project_root,
     )
+    summarize_feedback(
+        evaluations_file=candidate_evaluations_path,
+        requirements_file=job_requirements_path,
+        output_file=feedback_summary_path,
+        project_root=project_root,
+        feedback_dir=feedback_dir,
+    )
 
     individual_feedback_path = feedback_dir / f"candidate_{args.candidate_id}_feedback.json"
 
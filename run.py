@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+"""Launch the FastAPI service with uvloop (where available)/httptools and multiple workers."""
+
+import os
+
+import uvicorn
+
+
+def main() -> None:
+    # Evaluation task status lives in each worker's memory, so polling
+    # /tasks/{id} only works reliably with a single worker. "auto" picks
+    # uvloop when it is installed (it is not on Windows) and asyncio otherwise.
+    uvicorn.run(
+        "app:app",
+        host=os.getenv("HOST", "0.0.0.0"),
+        port=int(os.getenv("PORT", "8000")),
+        loop="auto",
+        http="httptools",
+        workers=int(os.getenv("WEB_CONCURRENCY", "1")),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -10,7 +10,9 @@ from pathlib import Path
 from typing import Optional, List
 
 # Ensure sibling modules are importable when running as a script
-sys.path.insert(0, str(Path(__file__).parent))
+_SRC_DIR = str(Path(__file__).parent)
+if _SRC_DIR not in sys.path:
+    sys.path.insert(0, _SRC_DIR)
 
 from job_requirements_analyzer import (
     load_job_analysis,
@@ -32,6 +34,13 @@ def run_candidate_evaluation(
     output_dir: str = "data",
     show_details: bool = True,
     project_root: Optional[Path] = None,
+    max_workers: Optional[int] = None,
+    use_cache: bool = True,
+    refresh: bool = False,
+    verbose: bool = False,
+    fail_fast: bool = False,
+    durable: bool = False,
+    batch_size: Optional[int] = None,
 ) -> dict:
     """Load job requirements, evaluate candidates, and return a summary."""
     if project_root is None:
@@ -90,16 +99,24 @@ def run_candidate_evaluation(
     except ValueError:
         output_rel_str = str(output_file)
 
-    evaluations = evaluate_all_candidates(
+    total_evaluated = evaluate_all_candidates(
         candidate_ids=candidate_ids,
         requirements=requirements,
         output_file=output_rel_str,
         project_root=project_root,
+        max_workers=max_workers,
+        use_cache=use_cache,
+        refresh=refresh,
+        verbose=verbose,
+        fail_fast=fail_fast,
+        durable=durable,
+        batch_size=batch_size,
     )
 
     print("\n" + "=" * 80)
     print("STEP 2: Ranking candidates by affinity score")
     print("=" * 80)
+    # Evaluations are streamed to disk rather than kept in memory; rank from the file
     ranked_candidates = rank_candidates_by_affinity(
         profiles_file=output_rel_str,
         project_root=project_root,
@@ -110,7 +127,7 @@ def run_candidate_evaluation(
         "job_requirements": job_analysis,
         "requirements": requirements,
         "candidate_ids": candidate_ids,
-        "total_evaluated": len(evaluations),
+        "total_evaluated": total_evaluated,
         "ranked_candidates": ranked_candidates,
         "top_candidate": ranked_candidates[0] if ranked_candidates else None,
         "output_file": str(output_file),
@@ -142,6 +159,43 @@ def main():
         action="store_true",
         help="Hide detailed feature scores in ranking output",
     )
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=None,
+        help="Maximum concurrent candidate evaluations (default: min(#candidates, 16))",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Do not read or write cached candidate evaluations",
+    )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Re-evaluate all candidates and overwrite cached evaluations",
+    )
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="List the documents found for each candidate and show full tracebacks",
+    )
+    parser.add_argument(
+        "--fail-fast",
+        action="store_true",
+        help="Abort on the first candidate that fails to evaluate",
+    )
+    parser.add_argument(
+        "--durable",
+        action="store_true",
+        help="fsync the evaluations file before replacing the previous one",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=None,
+        help="Evaluate this many candidates per LLM call (default: one call per candidate)",
+    )
 
     args = parser.parse_args()
 
@@ -151,6 +205,13 @@ def main():
             candidate_ids=args.candidates,
             output_dir=args.output_dir,
             show_details=not args.hide_details,
+            max_workers=args.max_workers,
+            use_cache=not args.no_cache,
+            refresh=args.refresh,
+            verbose=args.verbose,
+            fail_fast=args.fail_fast,
+            durable=args.durable,
+            batch_size=args.batch_size,
         )
 
         print("=" * 80)
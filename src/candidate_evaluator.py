@@ -5,16 +5,39 @@ Evaluates candidates against job requirements and ranks them by affinity score.
 """
 
 import os
-import json
-from typing import List, Dict, Optional
+import re
+import heapq
+import hashlib
+import tempfile
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from operator import itemgetter
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 
+import orjson
+
 # Add parent directory to path to allow imports
 import sys
-sys.path.insert(0, str(Path(__file__).parent))
+_SRC_DIR = str(Path(__file__).parent)
+if _SRC_DIR not in sys.path:
+    sys.path.insert(0, _SRC_DIR)
 
-from candidate_profile_evaluator import evaluate_candidate, CandidateEvaluation, FeatureScore
+from candidate_profile_evaluator import (
+    EVALUATION_MODEL,
+    evaluate_candidate,
+    evaluate_candidate_batch,
+    directory_state,
+    format_requirements,
+    CandidateEvaluation,
+    EvaluationResponse,
+    FeatureScore,
+)
+from fs_utils import replace_file
+from llm_cache import get_cache_root
 
 
 def ensure_evaluation_model(evaluation) -> CandidateEvaluation:
@@ -38,7 +61,7 @@ def ensure_evaluation_model(evaluation) -> CandidateEvaluation:
         # Convert dict to Pydantic model
         # Pydantic will automatically convert nested dicts to FeatureScore objects
         try:
-            return CandidateEvaluation(**evaluation)
+            return CandidateEvaluation.model_validate(evaluation)
         except Exception as e:
             # Provide more helpful error message
             raise ValueError(
@@ -52,11 +75,16 @@ def ensure_evaluation_model(evaluation) -> CandidateEvaluation:
         )
 
 
+@lru_cache(maxsize=1)
 def get_project_root() -> Path:
     """Get the project root directory."""
     return Path(__file__).parent.parent
 
 
+# Candidate document directories: data/candidate_<id>
+_CANDIDATE_DIR_RE = re.compile(r"^candidate_(\d+)$")
+
+
 def get_candidate_ids(project_root: Path, data_dir: Optional[Path] = None) -> List[int]:
     """
     Discover candidate IDs from the data directory.
@@ -70,18 +98,16 @@ def get_candidate_ids(project_root: Path, data_dir: Optional[Path] = None) -> Li
     if data_dir is None:
         data_dir = project_root / "data"
     
-    candidate_ids = []
-    
     if not data_dir.exists():
-        return candidate_ids
+        return []
     
-    for item in data_dir.iterdir():
-        if item.is_dir() and item.name.startswith("candidate_"):
-            try:
-                candidate_id = int(item.name.split("_")[1])
-                candidate_ids.append(candidate_id)
-            except (ValueError, IndexError):
-                continue
+    # DirEntry.is_dir() uses the cached dirent type, avoiding a stat() per entry
+    with os.scandir(data_dir) as entries:
+        candidate_ids = [
+            int(match.group(1))
+            for entry in entries
+            if entry.is_dir() and (match := _CANDIDATE_DIR_RE.match(entry.name))
+        ]
     
     return sorted(candidate_ids)
 
@@ -103,112 +129,418 @@ def convert_weights_to_requirements(weights: Dict[str, float]) -> dict:
     return {"features": features}
 
 
+# Bump whenever the evaluation prompt, document formatting or scoring changes,
+# so evaluations cached by an older pipeline are no longer served
+_EVAL_CACHE_VERSION = 2
+
+
+def _requirements_hash(requirements: dict) -> str:
+    """
+    Stable short hash keying cached evaluations.
+
+    Covers the requirements plus the cache version, evaluation model and
+    response schema, so a change to any of them starts a fresh cache.
+    """
+    payload = orjson.dumps(
+        {
+            "version": _EVAL_CACHE_VERSION,
+            "model": EVALUATION_MODEL,
+            "schema": EvaluationResponse.model_json_schema(),
+            "requirements": requirements,
+        },
+        option=orjson.OPT_SORT_KEYS,
+    )
+    return hashlib.sha1(payload).hexdigest()[:12]
+
+
+def _evaluation_cache_path(project_root: Path, req_hash: str, candidate_id: int,
+                           candidate_dir: Path) -> Path:
+    """Location of a cached evaluation for one candidate/requirements pair."""
+    # Same directory state that keys the documents cache, hashed into the file name
+    doc_sig = hashlib.sha1(repr(directory_state(candidate_dir)).encode("utf-8")).hexdigest()[:12]
+    return get_cache_root(project_root) / "eval" / req_hash / f"{candidate_id}_{doc_sig}.json"
+
+
+def _load_cached_evaluation(cache_path: Path) -> Optional[CandidateEvaluation]:
+    """Return the cached evaluation at cache_path, or None if absent/unreadable."""
+    try:
+        return CandidateEvaluation.model_validate_json(cache_path.read_bytes())
+    except (OSError, ValueError):
+        return None
+
+
+def _save_cached_evaluation(cache_path: Path, evaluation: CandidateEvaluation) -> None:
+    """Atomically write an evaluation to the cache (best-effort)."""
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_text(evaluation.model_dump_json(), encoding="utf-8")
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
+
+
+def evaluation_entry(candidate_id: int, evaluation: CandidateEvaluation) -> dict:
+    """
+    Build the serialized profile stored for a candidate in the evaluations file.
+    
+    Args:
+        candidate_id: Candidate ID
+        evaluation: The candidate's evaluation
+        
+    Returns:
+        Dictionary with candidate_id, feature_scores and affinity_score
+    """
+    # One pydantic-core call yields JSON-ready primitives for orjson
+    return {"candidate_id": candidate_id, **evaluation.model_dump(mode="json")}
+
+
+def _evaluation_log_header(candidate_id: int, candidate_dir: Path, verbose: bool) -> List[str]:
+    """Opening log lines for one candidate, listing its documents when verbose."""
+    lines = [
+        f"\n{'='*60}",
+        f"Evaluating Candidate {candidate_id}...",
+        f"{'='*60}",
+    ]
+    if verbose and candidate_dir.exists():
+        # List available documents
+        with os.scandir(candidate_dir) as entries:
+            available_files = [entry.name for entry in entries if entry.is_file()]
+        if available_files:
+            lines.append(f"   Documents found: {', '.join(available_files)}")
+        else:
+            lines.append(f"   ⚠ No documents found in candidate directory")
+    return lines
+
+
+def _lookup_cached_evaluation(
+    candidate_id: int,
+    candidate_dir: Path,
+    req_hash: str,
+    project_root: Path,
+    use_cache: bool,
+    refresh: bool,
+    lines: List[str]
+) -> Tuple[Optional[Path], Optional[CandidateEvaluation]]:
+    """Return (cache path or None, cached evaluation or None) for one candidate."""
+    if not use_cache:
+        return None, None
+    cache_path = _evaluation_cache_path(
+        project_root,
+        req_hash,
+        candidate_id,
+        candidate_dir,
+    )
+    evaluation = None
+    if not refresh:
+        evaluation = _load_cached_evaluation(cache_path)
+        if evaluation is not None:
+            lines.append(f"   ♻ Using cached evaluation")
+    return cache_path, evaluation
+
+
+def _log_evaluation_success(candidate_id: int, evaluation: CandidateEvaluation, lines: List[str]) -> None:
+    lines.append(f"✅ Candidate {candidate_id} evaluated successfully")
+    lines.append(f"   Affinity Score: {evaluation.affinity_score:.4f}")
+    lines.append(f"   Feature Scores:")
+    for feature in evaluation.feature_scores:
+        lines.append(f"     - {feature.name}: {feature.score:.4f} (weight: {feature.weight:.2f})")
+
+
+def _log_evaluation_failure(candidate_id: int, error: Exception, lines: List[str], verbose: bool) -> None:
+    lines.append(f"❌ Error evaluating candidate {candidate_id}: {error}")
+    lines.append(f"   Error type: {type(error).__name__}")
+    if verbose:
+        # Full stack formatting is costly; only pay for it when asked
+        lines.append("".join(traceback.format_exception(error)).rstrip())
+
+
+def _evaluate_candidate_logged(
+    candidate_id: int,
+    requirements: dict,
+    requirements_json: str,
+    req_hash: str,
+    project_root: Path,
+    use_cache: bool = True,
+    refresh: bool = False,
+    verbose: bool = False
+) -> Tuple[Optional[CandidateEvaluation], List[str]]:
+    """
+    Evaluate one candidate, collecting progress output instead of printing it.
+    
+    ``requirements_json`` and ``req_hash`` are derived from ``requirements`` once
+    per run by evaluate_all_candidates and shared by every candidate.
+    
+    Evaluations are cached under .cache/eval keyed by the requirements and
+    the candidate's document signature. ``use_cache=False`` bypasses the cache
+    entirely; ``refresh=True`` ignores existing entries but stores new results.
+    ``verbose=True`` also lists the documents found for the candidate and
+    includes the full traceback on failure.
+    
+    Returns:
+        Tuple of (evaluation or None on failure, log lines)
+    """
+    candidate_dir = project_root / "data" / f"candidate_{candidate_id}"
+    lines = []
+    
+    try:
+        lines = _evaluation_log_header(candidate_id, candidate_dir, verbose)
+        cache_path, evaluation = _lookup_cached_evaluation(
+            candidate_id, candidate_dir, req_hash, project_root, use_cache, refresh, lines
+        )
+        
+        if evaluation is None:
+            evaluation = evaluate_candidate(
+                candidate_id,
+                requirements,
+                project_root=project_root,
+                requirements_json=requirements_json,
+            )
+            # Ensure evaluation is a Pydantic model (defensive programming)
+            evaluation = ensure_evaluation_model(evaluation)
+            if cache_path is not None:
+                _save_cached_evaluation(cache_path, evaluation)
+        
+        _log_evaluation_success(candidate_id, evaluation, lines)
+        return evaluation, lines
+            
+    except Exception as e:
+        _log_evaluation_failure(candidate_id, e, lines, verbose)
+        return None, lines
+
+
+def _evaluate_single_logged(candidate_ids: List[int], *args) -> List[Tuple[int, Optional[CandidateEvaluation], List[str]]]:
+    """Adapt _evaluate_candidate_logged to the job shape of _evaluate_batch_logged."""
+    candidate_id, = candidate_ids
+    return [(candidate_id, *_evaluate_candidate_logged(candidate_id, *args))]
+
+
+def _evaluate_batch_logged(
+    candidate_ids: List[int],
+    requirements: dict,
+    requirements_json: str,
+    req_hash: str,
+    project_root: Path,
+    use_cache: bool = True,
+    refresh: bool = False,
+    verbose: bool = False
+) -> List[Tuple[int, Optional[CandidateEvaluation], List[str]]]:
+    """
+    Batched counterpart of _evaluate_candidate_logged.
+    
+    Cached candidates are served from the cache; the rest are evaluated
+    together with one LLM call via evaluate_candidate_batch. A candidate that
+    fails (e.g. has no documents) is reported on its own without affecting
+    the others in the batch.
+    
+    Returns:
+        List of (candidate ID, evaluation or None on failure, log lines),
+        one per candidate in input order
+    """
+    logs: Dict[int, List[str]] = {}
+    cache_paths: Dict[int, Optional[Path]] = {}
+    evaluations: Dict[int, CandidateEvaluation] = {}
+    errors: Dict[int, Exception] = {}
+    pending = []
+    for candidate_id in candidate_ids:
+        candidate_dir = project_root / "data" / f"candidate_{candidate_id}"
+        lines = logs[candidate_id] = []
+        try:
+            lines.extend(_evaluation_log_header(candidate_id, candidate_dir, verbose))
+            cache_paths[candidate_id], evaluation = _lookup_cached_evaluation(
+                candidate_id, candidate_dir, req_hash, project_root, use_cache, refresh, lines
+            )
+        except Exception as e:
+            errors[candidate_id] = e
+            continue
+        if evaluation is None:
+            pending.append(candidate_id)
+        else:
+            evaluations[candidate_id] = evaluation
+    
+    if pending:
+        batch_evaluations, batch_errors = evaluate_candidate_batch(
+            pending,
+            requirements,
+            project_root=project_root,
+            requirements_json=requirements_json,
+        )
+        errors.update(batch_errors)
+        for candidate_id, evaluation in batch_evaluations.items():
+            evaluations[candidate_id] = evaluation
+            if cache_paths.get(candidate_id) is not None:
+                _save_cached_evaluation(cache_paths[candidate_id], evaluation)
+    
+    outcomes = []
+    for candidate_id in candidate_ids:
+        lines = logs[candidate_id]
+        evaluation = evaluations.get(candidate_id)
+        if evaluation is not None:
+            _log_evaluation_success(candidate_id, evaluation, lines)
+        else:
+            _log_evaluation_failure(
+                candidate_id,
+                errors.get(candidate_id, RuntimeError("No evaluation returned")),
+                lines,
+                verbose,
+            )
+        outcomes.append((candidate_id, evaluation, lines))
+    return outcomes
+
+
 def evaluate_all_candidates(
     candidate_ids: List[int],
     requirements: dict,
     output_file: str = "data/candidate_evaluations.json",
-    project_root: Path = None
-) -> Dict[int, CandidateEvaluation]:
+    project_root: Path = None,
+    max_workers: Optional[int] = None,
+    use_cache: bool = True,
+    refresh: bool = False,
+    verbose: bool = False,
+    fail_fast: bool = False,
+    durable: bool = False,
+    batch_size: Optional[int] = None
+) -> int:
     """
-    Evaluate all candidates and save their profiles to a JSON file.
+    Evaluate all candidates concurrently and save their profiles to a JSON file.
+    
+    Each profile is streamed to the file as soon as it completes and is not
+    kept in memory; rank from the written file with rank_candidates_by_affinity.
     
     Args:
         candidate_ids: List of candidate IDs to evaluate
         requirements: Dictionary containing requirements with features and weights
         output_file: Path to the output JSON file (relative to project root)
         project_root: Optional project root path (defaults to auto-detected)
+        max_workers: Maximum concurrent LLM calls (defaults to min(#candidates, 16))
+        use_cache: Reuse/store cached evaluations under .cache/eval
+        refresh: Re-evaluate even when a cached evaluation exists (still stores it)
+        verbose: List each candidate's documents and print full tracebacks
+        fail_fast: Abort the whole run on the first failed candidate
+        durable: fsync the evaluations file before it replaces the old one
+        batch_size: Evaluate this many candidates per LLM call (see
+            evaluate_candidate_batch) instead of one call per candidate
         
     Returns:
-        Dictionary mapping candidate IDs to their evaluations
+        Number of candidate profiles saved
+        
+    Raises:
+        RuntimeError: If fail_fast is set and a candidate evaluation fails
+        ValueError: If batch_size is less than 1
     """
+    if batch_size is not None and batch_size < 1:
+        raise ValueError(f"batch_size must be at least 1, got {batch_size}")
     if project_root is None:
         project_root = get_project_root()
     output_path = project_root / output_file
     
-    all_profiles = {}
+    # Timestamp the run once, when it starts
+    evaluation_date = datetime.now().isoformat()
+    
+    # Ensure output directory exists before spending any LLM calls
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    
+    evaluated = 0
     
     print(f"Evaluating {len(candidate_ids)} candidates...")
     
-    for candidate_id in candidate_ids:
-        print(f"\n{'='*60}")
-        print(f"Evaluating Candidate {candidate_id}...")
-        print(f"{'='*60}")
-        
-        try:
-            # Check what documents are available for this candidate
-            candidate_dir = project_root / "data" / f"candidate_{candidate_id}"
+    # Stream each evaluation to disk as soon as it completes instead of
+    # building the whole document in memory; metadata is written last so
+    # it can carry the final count.
+    # Requirements are identical for every candidate: serialize and hash once
+    requirements_json = format_requirements(requirements)
+    req_hash = _requirements_hash(requirements)
+    
+    # Write to a temporary file in the same directory and atomically swap it
+    # in, so a crash or aborted run never leaves a truncated evaluations file
+    tmp_file = tempfile.NamedTemporaryFile(
+        dir=output_path.parent,
+        prefix=f"{output_path.name}.",
+        suffix=".tmp",
+        delete=False,
+    )
+    try:
+        with tmp_file as f:
+            f.write(b'{\n  "candidates": {')
+            separator = b"\n"
             
-            if candidate_dir.exists():
-                # List available documents
-                available_files = [f.name for f in candidate_dir.iterdir() if f.is_file()]
-                if available_files:
-                    print(f"   Documents found: {', '.join(available_files)}")
+            if candidate_ids:
+                if batch_size:
+                    # Each job is one LLM call covering a whole batch
+                    jobs = [
+                        candidate_ids[i:i + batch_size]
+                        for i in range(0, len(candidate_ids), batch_size)
+                    ]
+                    evaluate_job = _evaluate_batch_logged
                 else:
-                    print(f"   ⚠ No documents found in candidate directory")
-            
-            evaluation = evaluate_candidate(candidate_id, requirements,project_root=project_root)
-            # Ensure evaluation is a Pydantic model (defensive programming)
-            evaluation = ensure_evaluation_model(evaluation)
-            all_profiles[candidate_id] = evaluation
-            
-            print(f"✅ Candidate {candidate_id} evaluated successfully")
-            print(f"   Affinity Score: {evaluation.affinity_score:.4f}")
-            print(f"   Feature Scores:")
-            for feature in evaluation.feature_scores:
-                print(f"     - {feature.name}: {feature.score:.4f} (weight: {feature.weight:.2f})")
+                    jobs = [[candidate_id] for candidate_id in candidate_ids]
+                    evaluate_job = _evaluate_single_logged
                 
-        except Exception as e:
-            print(f"❌ Error evaluating candidate {candidate_id}: {e}")
-            print(f"   Error type: {type(e).__name__}")
-            import traceback
-            traceback.print_exc()
-            continue
-    
-    # Convert to serializable format (evaluation is a Pydantic model)
-    profiles_data = {
-        "metadata": {
-            "evaluation_date": datetime.now().isoformat(),
-            "total_candidates": len(all_profiles),
-            "requirements": requirements
-        },
-        "candidates": {}
-    }
-    
-    for candidate_id, evaluation in all_profiles.items():
-        # Ensure evaluation is a Pydantic model (defensive programming)
-        evaluation = ensure_evaluation_model(evaluation)
-        
-        # evaluation is a CandidateEvaluation Pydantic model
-        profiles_data["candidates"][str(candidate_id)] = {
-            "candidate_id": candidate_id,
-            "feature_scores": [
-                {
-                    "name": feature.name,
-                    "weight": feature.weight,
-                    "score": feature.score
-                }
-                for feature in evaluation.feature_scores
-            ],
-            "affinity_score": evaluation.affinity_score
-        }
-    
-    # Ensure output directory exists
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    
-    # Save to file
-    with open(output_path, "w") as f:
-        json.dump(profiles_data, f, indent=2)
+                # Each evaluation is an independent, I/O-bound LLM call
+                workers = max_workers or min(len(jobs), 16)
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    futures = [
+                        executor.submit(
+                            evaluate_job,
+                            ids,
+                            requirements,
+                            requirements_json,
+                            req_hash,
+                            project_root,
+                            use_cache,
+                            refresh,
+                            verbose,
+                        )
+                        for ids in jobs
+                    ]
+                    for future in as_completed(futures):
+                        for candidate_id, evaluation, log_lines in future.result():
+                            # Print each candidate's log as one block so threads don't interleave
+                            print("\n".join(log_lines))
+                            if evaluation is None:
+                                if fail_fast:
+                                    executor.shutdown(wait=False, cancel_futures=True)
+                                    raise RuntimeError(
+                                        f"Evaluation of candidate {candidate_id} failed (fail-fast)"
+                                    )
+                                continue
+                            
+                            # The logged evaluators already return validated models
+                            entry = evaluation_entry(candidate_id, evaluation)
+                            f.write(separator)
+                            f.write(b'    "%d": ' % candidate_id)
+                            f.write(orjson.dumps(entry))
+                            separator = b",\n"
+                            evaluated += 1
+            
+            metadata = {
+                "evaluation_date": evaluation_date,
+                "total_candidates": evaluated,
+                "requirements": requirements
+            }
+            f.write(b'\n  },\n  "metadata": ')
+            f.write(orjson.dumps(metadata))
+            f.write(b"\n}\n")
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+        replace_file(tmp_file.name, output_path)
+    except BaseException:
+        Path(tmp_file.name).unlink(missing_ok=True)
+        raise
     
     print(f"\n{'='*60}")
     print(f"✅ All profiles saved to {output_path}")
     print(f"{'='*60}")
     
-    return all_profiles
+    return evaluated
 
 
 def rank_candidates_by_affinity(
     profiles_file: str = "data/candidate_evaluations.json",
-    project_root: Path = None
+    project_root: Path = None,
+    profiles_data: Optional[dict] = None,
+    top_k: Optional[int] = None
 ) -> List[Dict]:
     """
     Read candidate profiles from a JSON file and rank them by affinity score.
@@ -216,34 +548,86 @@ def rank_candidates_by_affinity(
     Args:
         profiles_file: Path to the JSON file containing candidate profiles (relative to project root)
         project_root: Optional project root path (defaults to auto-detected)
+        profiles_data: Already-loaded profiles (same shape as the file); skips the file read
+        top_k: If set, only return the top_k candidates (partial O(n log k) selection)
         
     Returns:
         List of candidate profiles sorted by affinity score (descending)
     """
-    if project_root is None:
-        project_root = get_project_root()
-    profiles_path = project_root / profiles_file
-    
-    if not profiles_path.exists():
-        raise FileNotFoundError(
-            f"Profiles file not found: {profiles_path}\n"
-            f"Please run evaluate_all_candidates() first to generate the profiles file."
-        )
-    
-    with open(profiles_path, "r") as f:
-        profiles_data = json.load(f)
+    if profiles_data is None:
+        if project_root is None:
+            project_root = get_project_root()
+        profiles_path = project_root / profiles_file
+        
+        if not profiles_path.exists():
+            raise FileNotFoundError(
+                f"Profiles file not found: {profiles_path}\n"
+                f"Please run evaluate_all_candidates() first to generate the profiles file."
+            )
+        
+        with open(profiles_path, "rb") as f:
+            profiles_data = orjson.loads(f.read())
     
     # Extract candidates and sort by affinity score
     candidates = list(profiles_data["candidates"].values())
+    if top_k is not None:
+        return heapq.nlargest(top_k, candidates, key=itemgetter("affinity_score"))
+    
     ranked_candidates = sorted(
         candidates,
-        key=lambda x: x["affinity_score"],
+        key=itemgetter("affinity_score"),
         reverse=True
     )
     
     return ranked_candidates
 
 
+def weighted_affinity(feature_scores: List[Dict], weights: Optional[Dict[str, float]] = None) -> float:
+    """
+    Compute the weighted average of feature scores.
+    
+    Args:
+        feature_scores: List of {"name", "weight", "score"} dicts
+        weights: Optional feature name -> weight overrides (defaults to each feature's own weight)
+        
+    Returns:
+        Weighted average score, or 0.0 if the total weight is zero
+    """
+    total_weight = 0.0
+    weighted_sum = 0.0
+    for feature in feature_scores:
+        weight = feature["weight"] if weights is None else weights.get(feature["name"], feature["weight"])
+        total_weight += weight
+        weighted_sum += weight * feature["score"]
+    return weighted_sum / total_weight if total_weight else 0.0
+
+
+def recompute_affinity(ranked_candidates: List[Dict], new_weights: Dict[str, float]) -> List[Dict]:
+    """
+    Re-rank candidates after changing feature weights, without new LLM calls.
+    
+    Args:
+        ranked_candidates: Candidate profiles as returned by rank_candidates_by_affinity
+        new_weights: Feature name -> weight; features not listed keep their current weight
+        
+    Returns:
+        New list of candidate profiles with updated weights and affinity scores,
+        sorted by affinity score (descending)
+    """
+    rescored = []
+    for candidate in ranked_candidates:
+        feature_scores = [
+            {**feature, "weight": new_weights.get(feature["name"], feature["weight"])}
+            for feature in candidate["feature_scores"]
+        ]
+        rescored.append({
+            **candidate,
+            "feature_scores": feature_scores,
+            "affinity_score": weighted_affinity(feature_scores),
+        })
+    return sorted(rescored, key=itemgetter("affinity_score"), reverse=True)
+
+
 def print_ranking(ranked_candidates: List[Dict], show_details: bool = False):
     """
     Print the candidate ranking in a formatted way.
@@ -252,25 +636,35 @@ def print_ranking(ranked_candidates: List[Dict], show_details: bool = False):
         ranked_candidates: List of ranked candidate profiles
         show_details: If True, show detailed feature scores for each candidate
     """
-    print(f"\n{'='*80}")
-    print(f"CANDIDATE RANKING BY AFFINITY SCORE")
-    print(f"{'='*80}\n")
+    # Build the whole report and write it once rather than one print per line
+    lines = [
+        "",
+        "=" * 80,
+        "CANDIDATE RANKING BY AFFINITY SCORE",
+        "=" * 80,
+        "",
+    ]
     
     for rank, candidate in enumerate(ranked_candidates, 1):
         candidate_id = candidate["candidate_id"]
         affinity_score = candidate["affinity_score"]
         
-        print(f"Rank {rank}: Candidate {candidate_id}")
-        print(f"  Affinity Score: {affinity_score:.4f}")
+        lines.append(f"Rank {rank}: Candidate {candidate_id}")
+        lines.append(f"  Affinity Score: {affinity_score:.4f}")
         
         if show_details:
-            print(f"  Feature Scores:")
-            for feature in candidate["feature_scores"]:
-                print(f"    - {feature['name']}: {feature['score']:.4f} "
-                      f"(weight: {feature['weight']:.2f})")
-        print()
+            lines.append("  Feature Scores:")
+            lines.extend(
+                f"    - {feature['name']}: {feature['score']:.4f} "
+                f"(weight: {feature['weight']:.2f})"
+                for feature in candidate["feature_scores"]
+            )
+        lines.append("")
+    
+    lines.append("=" * 80)
+    lines.append("")
     
-    print(f"{'='*80}\n")
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 if __name__ == "__main__":
@@ -300,7 +694,7 @@ if __name__ == "__main__":
     print("\n" + "="*80)
     print("STEP 1: Evaluating all candidates")
     print("="*80)
-    all_profiles = evaluate_all_candidates(candidate_ids, requirements, project_root=project_root)
+    evaluate_all_candidates(candidate_ids, requirements, project_root=project_root)
     
     # Rank candidates by affinity score
     print("\n" + "="*80)
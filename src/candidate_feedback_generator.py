@@ -6,24 +6,36 @@ Focuses on technical skills, strengths, and improvement areas.
 """
 
 import argparse
+import asyncio
+import io
+import itertools
+import multiprocessing
 import os
+import re
+import hashlib
 import sys
-import json
+import tempfile
+import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from operator import itemgetter
 from pathlib import Path
-from dotenv import load_dotenv
-from pydantic import BaseModel, Field
-from typing import List, Dict, Optional
+import orjson
+from pydantic import BaseModel, Field, TypeAdapter
+from typing import TYPE_CHECKING, Callable, Iterator, List, Dict, Optional, TextIO, Tuple
 from datetime import datetime
 
-# Google GenAI imports
-from google import genai
-from google.genai import types
+from fs_utils import replace_file
+from llm_cache import cache_key, get_cache_dir
+from llm_http import client_http_options, retry_transient
+from llm_json import strip_fence
 
-# Import existing modules for data access
-from candidate_profile_evaluator import (
-    scan_candidate_documents,
-    format_candidate_information
-)
+# Google GenAI and the profile evaluator (which builds its own client) are
+# imported on first use so that importing this module stays cheap
+if TYPE_CHECKING:
+    from google.genai import types
 
 # -------------------------------
 # 1️⃣ Pydantic models for structured feedback
@@ -54,83 +66,166 @@ class CandidateFeedback(BaseModel):
     industry_alignment_score: float = Field(description="Score from 0.0 to 1.0 indicating overall industry readiness")
     next_steps_summary: str = Field(description="Concise summary of recommended next steps for career development")
 
+# Validator built once and reused for every response
+_FEEDBACK_ADAPTER = TypeAdapter(CandidateFeedback)
+
 # -------------------------------
 # 2️⃣ Load environment and initialize client
 # -------------------------------
 
-load_dotenv()
+# Single-candidate requests default to the full model. Bulk jobs over many
+# candidates default to the lite model: feedback is schema-constrained JSON
+# from a long context, where lite is cheaper per candidate, has lower latency
+# per token and a larger concurrent quota. Lite outputs that fail validation
+# are retried on the full model.
+FEEDBACK_MODEL = "gemini-2.5-flash"
+BULK_FEEDBACK_MODEL = "gemini-2.5-flash-lite"
+FEEDBACK_FALLBACK_MODEL = FEEDBACK_MODEL
 
-PROJECT_ID = os.getenv("GOOGLE_CLOUD_PROJECT")
-LOCATION = os.getenv("GOOGLE_CLOUD_LOCATION", "us-central1")
+_feedback_call_stats = {"calls": 0, "promoted": 0}
+_feedback_call_stats_lock = threading.Lock()
+
+
+def _record_feedback_call(promoted: bool = False) -> None:
+    """Count a feedback call, or a promotion to the fallback model."""
+    with _feedback_call_stats_lock:
+        _feedback_call_stats["promoted" if promoted else "calls"] += 1
+
+
+def feedback_promotion_rate() -> float:
+    """Fraction of feedback calls in this process retried on the fallback model."""
+    with _feedback_call_stats_lock:
+        calls = _feedback_call_stats["calls"]
+        return _feedback_call_stats["promoted"] / calls if calls else 0.0
+
+
+@lru_cache(maxsize=1)
+def _get_clients() -> tuple:
+    """
+    Create one Vertex AI client per configured feedback location on first use.
+
+    Each region has its own quota, so spreading concurrent calls across
+    GLOBALAI_FEEDBACK_LOCATIONS raises the effective rate limit. The clients
+    (and their connection pools) are shared by every thread and coroutine in
+    the process.
+    """
+    from google import genai
+    from settings import get_settings
+
+    settings = get_settings()
+    http_options = client_http_options()
+    return tuple(
+        genai.Client(
+            vertexai=True,
+            project=settings.project_id,
+            location=location,
+            http_options=http_options,
+        )
+        for location in settings.feedback_locations
+    )
 
-client = genai.Client(
-    vertexai=True,
-    project=PROJECT_ID,
-    location=LOCATION
-)
 
+def _get_client(index: int = 0):
+    """Return the client for a region slot; index wraps around the pool."""
+    clients = _get_clients()
+    return clients[index % len(clients)]
+
+
+def _client_slot(candidate_id: int) -> int:
+    """Region slot for a candidate; stable so reruns hit the same region's caches."""
+    return candidate_id % len(_get_clients())
+
+
+@lru_cache(maxsize=1)
 def get_project_root() -> Path:
     """Get the project root directory."""
     return Path(__file__).parent.parent
 
 
 # -------------------------------
-# 3️⃣ Core feedback generation function
+# 3️⃣ Expert-level feedback prompt
 # -------------------------------
 
-def generate_candidate_feedback(
-    candidate_id: int,
-    evaluation_data: dict,
-    job_requirements: dict,
-    project_root: Path = None
-) -> CandidateFeedback:
-    """
-    Generate comprehensive, actionable feedback for a rejected candidate.
+# Static instructions, identical for every candidate and job. Sent as the
+# system instruction so the variable data stays at the end of the request
+# and the shared prefix is eligible for Gemini's implicit prefix caching.
+FEEDBACK_SYSTEM_PROMPT = """You are a senior technical talent consultant. Write constructive, evidence-based feedback for a candidate who was not selected, using the job context, candidate profile, evaluation scores and identified gaps provided.
 
-    This function analyzes the candidate's complete profile, their evaluation scores,
-    and the job requirements to generate personalized feedback focused on:
-    - Technical strengths with evidence
-    - Areas for improvement with actionable recommendations
-    - Industry alignment and career development guidance
+CONSTRAINTS: objective and grounded in the candidate's documents; technical and professional skills only; no personality, psychology or character judgements; no vague advice (every recommendation concrete and actionable); reference current industry standards and the role's requirements; frame gaps as growth opportunities, never discouraging.
 
-    Args:
-        candidate_id: The candidate's ID
-        evaluation_data: Dictionary containing the candidate's evaluation results
-        job_requirements: Dictionary containing job requirements, technical skills, and weights
-        project_root: Optional project root path (defaults to auto-detected)
+OUTPUT (JSON matching the CandidateFeedback schema):
+1. profile_summary: balanced 2-3 sentence assessment; 2-3 standout qualities; career stage and readiness for this kind of role.
+2. technical_strengths (3-5): skill area, specific evidence from CV/LinkedIn/other documents, proficiency (Foundational | Intermediate | Advanced | Expert).
+3. improvement_areas (3-4), ordered by feature weight and score gap: dimension, current gap vs. role/industry, why it matters, 3-5 specific recommendations (courses/certifications, projects, communities/resources, measurable milestones, mentorship), timeline (Short-term 1-3 months | Medium-term 3-6 months | Long-term 6-12+ months).
+4. industry_alignment_score (0.0-1.0) on skill currency, experience relevance and trajectory: 0.6-0.7 needs development, 0.7-0.8 competitive with growth areas, 0.8-0.9 strong, 0.9+ exceptional.
+5. next_steps_summary: 2-3 sentences on the highest-impact actions, framed around growth.
 
-    Returns:
-        CandidateFeedback object with structured feedback
+Return ONLY valid JSON."""
 
-    Raises:
-        ValueError: If candidate documents or evaluation data is missing
-    """
-    if project_root is None:
-        project_root = get_project_root()
+# Per-job and per-candidate prompt sections, filled with str.format_map
+_JOB_CONTEXT_TMPL = """**JOB CONTEXT:**
 
-    candidate_dir = project_root / "data" / f"candidate_{candidate_id}"
+Company: {company_name}
+{tech_skills_context}
+{culture_context}
 
-    # Load candidate documents
-    documents = scan_candidate_documents(candidate_dir)
+Critical Success Factors for This Role:
+{critical_features_text}
 
-    if not documents['all_content']:
-        raise ValueError(
-            f"No documents found for candidate {candidate_id}. "
-            f"Cannot generate feedback without candidate profile data."
-        )
+---
+
+"""
+_CANDIDATE_PROMPT_HEAD_TMPL = (
+    "{job_context}**CANDIDATE PROFILE DATA:**\n\n"
+    "{candidate_profile}\n\n---\n\n"
+    "**EVALUATION RESULTS:**\n\n"
+    "Overall Affinity Score: {affinity_score:.2f} / 1.0\n\n"
+    "Feature Scores:\n"
+)
+_SCORE_LINE_TMPL = "- {name}: {score:.2f} (weight: {weight:.1f})\n"
+_score_and_weight = itemgetter('score', 'weight')
+_GAPS_HEADER = "\n---\n\n**IDENTIFIED GAPS:**\n\nAreas Scoring Below Competitive Threshold:\n"
 
-    # Format candidate information
-    candidate_profile = format_candidate_information(documents)
+# The schema and generation config are constant, so build them once
+_FEEDBACK_JSON_SCHEMA = CandidateFeedback.model_json_schema()
 
-    # Extract relevant data from evaluation
-    feature_scores = evaluation_data.get('feature_scores', [])
-    affinity_score = evaluation_data.get('affinity_score', 0.0)
+# Slightly higher than evaluation for more nuanced feedback; a response from
+# the full model that fails validation is resampled once at _RETRY_TEMPERATURE
+_FEEDBACK_TEMPERATURE = 0.2
+_RETRY_TEMPERATURE = 0.5
 
-    # Extract job context
-    tech_skills = job_requirements.get('tech_skills', [])
-    company_name = job_requirements.get('company_name', 'the target company')
-    company_culture = job_requirements.get('company_culture', '')
-    job_description = job_requirements.get('job_description', '')
+
+@lru_cache(maxsize=2)
+def _feedback_config(temperature: float = _FEEDBACK_TEMPERATURE) -> "types.GenerateContentConfig":
+    """Generation config for structured feedback output (built on first use)."""
+    from google.genai import types
+
+    return types.GenerateContentConfig(
+        system_instruction=FEEDBACK_SYSTEM_PROMPT,
+        response_mime_type="application/json",
+        response_json_schema=_FEEDBACK_JSON_SCHEMA,
+        temperature=temperature,
+    )
+
+
+# Rate limiting (429) and transient server errors are retried with exponential
+# backoff and jitter. Callers hold their concurrency slot while waiting, so
+# retries cannot stampede the API as it recovers.
+_retry_transient = retry_transient(max_attempts=5)
+
+
+def _job_requirements_hash(job_requirements: dict) -> str:
+    """Stable hash of the job requirements, used to share job context within a batch."""
+    payload = orjson.dumps(job_requirements, option=orjson.OPT_SORT_KEYS)
+    return hashlib.sha256(payload).hexdigest()
+
+
+# -------------------------------
+# 4️⃣ Core feedback generation function
+# -------------------------------
+
+def _build_feature_weights(job_requirements: dict) -> Dict[str, float]:
+    """Resolve feature name -> weight from weights_dict, or weights + features."""
     feature_weights_raw = (
         job_requirements.get('weights_dict')
         or job_requirements.get('weights')
@@ -154,196 +249,477 @@ def generate_candidate_feedback(
     else:
         feature_weights = {}
 
-    # Identify high-importance features (weight >= 0.8)
-    critical_features = [
-        {"name": name, "weight": weight}
-        for name, weight in feature_weights.items()
-        if weight >= 0.8
-    ]
+    return feature_weights
 
-    # Identify underperforming features (score < 0.7) in high-weight areas
-    weak_areas = [
-        fs for fs in feature_scores
-        if fs['score'] < 0.7 and fs['weight'] >= 0.6
-    ]
 
-    # Build context sections for the prompt
-    tech_skills_context = f"Technical Skills Required: {', '.join(tech_skills[:15])}" if tech_skills else ""
+def build_job_context(job_requirements: dict) -> str:
+    """
+    Build the job context block shared by every candidate of a job.
 
-    culture_context = f"\n\nCompany Culture Context:\n{company_culture}" if company_culture else ""
+    Depends only on the job requirements, so multi-candidate callers build it
+    once and pass it to build_feedback_prompt.
 
-    critical_features_text = "\n".join([
-        f"- {f['name']} (weight: {f['weight']:.1f})"
-        for f in critical_features
-    ])
+    Args:
+        job_requirements: Dictionary containing job requirements, technical skills, and weights
 
-    scores_summary = "\n".join([
-        f"- {fs['name']}: {fs['score']:.2f} (weight: {fs['weight']:.1f})"
-        for fs in feature_scores
-    ])
+    Returns:
+        Job context text placed ahead of the per-candidate sections
+    """
+    # Extract job context
+    tech_skills = job_requirements.get('tech_skills', [])
+    company_name = job_requirements.get('company_name', 'the target company')
+    company_culture = job_requirements.get('company_culture', '')
+    feature_weights = _build_feature_weights(job_requirements)
+
+    return _JOB_CONTEXT_TMPL.format_map({
+        "company_name": company_name,
+        "tech_skills_context": (
+            f"Technical Skills Required: {', '.join(tech_skills[:15])}" if tech_skills else ""
+        ),
+        "culture_context": (
+            f"\n\nCompany Culture Context:\n{company_culture}" if company_culture else ""
+        ),
+        # High-importance features (weight >= 0.8)
+        "critical_features_text": "\n".join([
+            f"- {name} (weight: {weight:.1f})"
+            for name, weight in feature_weights.items()
+            if weight >= 0.8
+        ]),
+    })
+
+
+# Candidate profiles above this many tokens are trimmed to the sections most
+# relevant to the job (tokens estimated at ~4 characters each)
+PROFILE_MAX_TOKENS = 6000
+_CHARS_PER_TOKEN = 4
+_PROFILE_SECTION_RE = re.compile(r"\n\s*\n")
+_KEYWORD_RE = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+
+
+def _job_keywords(job_requirements: dict) -> frozenset:
+    """Lowercased words from the job's skills, features and description."""
+    texts = list(job_requirements.get('tech_skills', []))
+    texts.extend(_build_feature_weights(job_requirements))
+    texts.append(job_requirements.get('job_description', ''))
+    keywords = set()
+    for text in texts:
+        keywords.update(_KEYWORD_RE.findall(str(text).lower()))
+    return frozenset(word for word in keywords if len(word) > 2)
+
+
+def _truncate_profile(
+    profile: str,
+    job_requirements: dict,
+    max_tokens: int = PROFILE_MAX_TOKENS,
+) -> str:
+    """Cap a candidate profile at about max_tokens, keeping the most job-relevant sections.
+
+    The profile is split into blank-line separated sections, each scored by how
+    many distinct job keywords it mentions. The best sections that fit the
+    budget are kept in their original order. Without keywords or sections to
+    choose from, the profile is cut at the budget instead.
+    """
+    budget = max_tokens * _CHARS_PER_TOKEN
+    if len(profile) <= budget:
+        return profile
+
+    keywords = _job_keywords(job_requirements)
+    sections = _PROFILE_SECTION_RE.split(profile)
+    if not keywords or len(sections) < 2:
+        return f"{profile[:budget]}\n... [truncated] ..."
+
+    scores = [
+        len(keywords.intersection(_KEYWORD_RE.findall(section.lower())))
+        for section in sections
+    ]
+    # Highest score first; ties keep document order so earlier sections (CVs) win
+    ranked = sorted(range(len(sections)), key=lambda i: -scores[i])
+    kept, used = set(), 0
+    for i in ranked:
+        size = len(sections[i]) + 2
+        if used + size <= budget:
+            kept.add(i)
+            used += size
+    if not kept:
+        return f"{sections[ranked[0]][:budget]}\n... [truncated] ..."
+
+    omitted = len(sections) - len(kept)
+    return "\n\n".join(sections[i] for i in sorted(kept)) + (
+        f"\n\n... [{omitted} less relevant sections omitted] ..."
+    )
 
-    weak_areas_text = "\n".join([
-        f"- {wa['name']}: {wa['score']:.2f} (weight: {wa['weight']:.1f})"
-        for wa in weak_areas
-    ]) if weak_areas else "No significant weak areas identified"
 
-    # -------------------------------
-    # 4️⃣ Expert-level feedback prompt
-    # -------------------------------
+def build_feedback_prompt(
+    candidate_id: int,
+    evaluation_data: dict,
+    job_requirements: dict,
+    project_root: Path = None,
+    job_context: Optional[str] = None,
+    max_profile_tokens: Optional[int] = PROFILE_MAX_TOKENS,
+) -> str:
+    """
+    Build the per-candidate feedback prompt.
 
-    prompt = f"""You are a senior technical talent consultant and hiring systems expert with 15+ years of experience in candidate assessment and career development coaching. Your expertise includes:
-- Analyzing technical competencies across diverse industries and roles
-- Identifying skill gaps and creating actionable development roadmaps
-- Providing evidence-based, objective feedback focused on professional growth
-- Understanding industry standards and competitive benchmarks for technical roles
+    The static instructions live in FEEDBACK_SYSTEM_PROMPT and are sent as the
+    system instruction, so only job and candidate data appear here.
 
-Your task is to generate comprehensive, constructive feedback for a candidate who was not selected for a position. This feedback should be:
-- **Objective and evidence-based**: Grounded in specific observations from their profile
-- **Actionable and practical**: Include concrete steps they can take to improve
-- **Technical-focused**: Emphasize technical skills, competencies, and professional capabilities
-- **Industry-aligned**: Reference current industry standards and market expectations
-- **Developmentally constructive**: Frame areas for improvement as growth opportunities
-- **NO psychological or personality-based feedback**: Focus strictly on skills, experience, and professional competencies
+    Args:
+        candidate_id: The candidate's ID
+        evaluation_data: Dictionary containing the candidate's evaluation results
+        job_requirements: Dictionary containing job requirements, technical skills, and weights
+        project_root: Optional project root path (defaults to auto-detected)
+        job_context: Optional prebuilt build_job_context output, reused across candidates
+        max_profile_tokens: Approximate token budget for the candidate profile;
+            longer profiles keep only their most job-relevant sections. None
+            sends the full profile.
 
----
+    Returns:
+        Prompt text for the feedback LLM call
 
-**CANDIDATE PROFILE DATA:**
+    Raises:
+        ValueError: If candidate documents are missing
+    """
+    from candidate_profile_evaluator import load_candidate_documents
 
-{candidate_profile}
+    if project_root is None:
+        project_root = get_project_root()
 
----
+    candidate_dir = project_root / "data" / f"candidate_{candidate_id}"
 
-**EVALUATION RESULTS:**
+    # Load and format candidate documents (cached while the directory is unchanged)
+    documents, candidate_profile = load_candidate_documents(candidate_dir, project_root)
 
-Overall Affinity Score: {affinity_score:.2f} / 1.0
+    if not documents['all_content']:
+        raise ValueError(
+            f"No documents found for candidate {candidate_id}. "
+            f"Cannot generate feedback without candidate profile data."
+        )
+    if max_profile_tokens is not None:
+        candidate_profile = _truncate_profile(candidate_profile, job_requirements, max_profile_tokens)
 
-Feature Scores:
-{scores_summary}
+    # Extract relevant data from evaluation
+    feature_scores = evaluation_data.get('feature_scores', [])
+    affinity_score = evaluation_data.get('affinity_score', 0.0)
 
----
+    if job_context is None:
+        job_context = build_job_context(job_requirements)
+
+    # Assemble the prompt from the module-level templates with a single join;
+    # score lines go straight into the output and underperforming features
+    # (score < 0.7) in high-weight areas reuse the same formatted line
+    parts = [
+        _CANDIDATE_PROMPT_HEAD_TMPL.format_map({
+            "job_context": job_context,
+            "candidate_profile": candidate_profile,
+            "affinity_score": affinity_score,
+        })
+    ]
+    weak_lines = []
+    for fs in feature_scores:
+        line = _SCORE_LINE_TMPL.format_map(fs)
+        parts.append(line)
+        score, weight = _score_and_weight(fs)
+        if score < 0.7 and weight >= 0.6:
+            weak_lines.append(line)
+
+    parts.append(_GAPS_HEADER)
+    if weak_lines:
+        parts.extend(weak_lines)
+    else:
+        parts.append("No significant weak areas identified\n")
 
-**JOB CONTEXT:**
+    return "".join(parts)
 
-Company: {company_name}
-{tech_skills_context}
-{culture_context}
 
-Critical Success Factors for This Role:
-{critical_features_text}
+def generate_candidate_feedback(
+    candidate_id: int,
+    evaluation_data: dict,
+    job_requirements: dict,
+    project_root: Path = None,
+    on_chunk: Optional[Callable[[str], None]] = None,
+    job_context: Optional[str] = None,
+    model_name: str = FEEDBACK_MODEL,
+) -> CandidateFeedback:
+    """
+    Generate comprehensive, actionable feedback for a rejected candidate.
 
----
+    This function analyzes the candidate's complete profile, their evaluation scores,
+    and the job requirements to generate personalized feedback focused on:
+    - Technical strengths with evidence
+    - Areas for improvement with actionable recommendations
+    - Industry alignment and career development guidance
 
-**IDENTIFIED GAPS:**
+    Args:
+        candidate_id: The candidate's ID
+        evaluation_data: Dictionary containing the candidate's evaluation results
+        job_requirements: Dictionary containing job requirements, technical skills, and weights
+        project_root: Optional project root path (defaults to auto-detected)
+        on_chunk: Optional callback receiving each response text chunk as it streams in
+        job_context: Optional prebuilt build_job_context output, reused across candidates
+        model_name: Gemini model to use; BULK_FEEDBACK_MODEL trades some depth
+            for lower cost and latency and is retried on FEEDBACK_FALLBACK_MODEL
+            when its output fails validation
 
-Areas Scoring Below Competitive Threshold:
-{weak_areas_text}
+    Returns:
+        CandidateFeedback object with structured feedback
 
----
+    Raises:
+        ValueError: If candidate documents or evaluation data is missing
+    """
+    prompt = build_feedback_prompt(
+        candidate_id=candidate_id,
+        evaluation_data=evaluation_data,
+        job_requirements=job_requirements,
+        project_root=project_root,
+        job_context=job_context,
+    )
 
-**YOUR FEEDBACK GENERATION INSTRUCTIONS:**
-
-1. **Profile Summary:**
-   - Provide an honest, balanced 2-3 sentence assessment of the candidate's overall profile
-   - Highlight 2-3 standout qualities or achievements that distinguish them
-   - Assess their career stage and current readiness level for roles like this
-
-2. **Technical Strengths (identify 3-5):**
-   For each strength:
-   - Specify the technical skill or competency area
-   - Provide specific evidence from their CV, LinkedIn, or other documents
-   - Assess their proficiency level: Foundational, Intermediate, Advanced, or Expert
-   - Focus on concrete skills (technologies, methodologies, domain knowledge)
-
-3. **Improvement Areas (identify 3-4, prioritized by impact):**
-   For each area:
-   - Name the specific dimension or skill area needing development
-   - Explain the current gap between their profile and industry/role requirements
-   - Clarify why this area is important for their target industry/roles
-   - Provide 3-5 **specific, actionable recommendations** such as:
-     * Specific courses, certifications, or training programs to pursue
-     * Projects or experiences to seek out (with examples)
-     * Technical communities, publications, or resources to engage with
-     * Measurable milestones to demonstrate progress
-     * Networking or mentorship opportunities to explore
-   - Provide a realistic timeline: Short-term (1-3 months), Medium-term (3-6 months), or Long-term (6-12+ months)
-
-   **Prioritization criteria:**
-   - Weight the importance based on the feature weights (higher weight = higher priority)
-   - Consider the candidate's current score vs. requirement (bigger gaps = higher priority)
-   - Focus on high-impact skills that significantly affect competitiveness
-
-4. **Industry Alignment Score (0.0 to 1.0):**
-   - Assess overall industry readiness considering current market standards
-   - Factor in: technical skill currency, experience relevance, professional development trajectory
-   - Be realistic: 0.6-0.7 = needs development, 0.7-0.8 = competitive with growth areas, 0.8-0.9 = strong candidate, 0.9+ = exceptional
-
-5. **Next Steps Summary:**
-   - Provide a concise 2-3 sentence summary of the most important next steps
-   - Prioritize the top 2-3 actions that will have the highest impact on their competitiveness
-   - Frame positively around growth and market positioning
+    # -------------------------------
+    # 5️⃣ Call LLM with structured output
+    # -------------------------------
 
----
+    try:
+        return _stream_feedback(model_name, prompt, _feedback_config(), on_chunk)
+    except ValueError as e:
+        # Schema/JSON failure: retry once on the full model, or resample the
+        # full model at a higher temperature
+        retry_config = _validation_retry_config(model_name, e)
+        return _stream_feedback(FEEDBACK_FALLBACK_MODEL, prompt, retry_config, on_chunk)
+    finally:
+        _record_feedback_call()
+
+
+def _validation_retry_config(model_name: str, error: Exception) -> "types.GenerateContentConfig":
+    """Config for the single retry after a response fails validation; logs the retry."""
+    if model_name == FEEDBACK_FALLBACK_MODEL:
+        print(f"{model_name} output failed validation ({error}); resampling at temperature {_RETRY_TEMPERATURE}")
+        return _feedback_config(_RETRY_TEMPERATURE)
+    _record_feedback_call(promoted=True)
+    print(f"{model_name} output failed validation ({error}); retrying on {FEEDBACK_FALLBACK_MODEL}")
+    return _feedback_config()
+
+
+@_retry_transient
+def _open_feedback_stream(
+    model: str,
+    prompt: str,
+    config: "types.GenerateContentConfig",
+) -> Iterator:
+    """
+    Start a streamed response and wait for its first chunk.
 
-**IMPORTANT GUIDELINES:**
-
-✅ DO:
-- Base all feedback on observable evidence from their documents
-- Use industry-standard terminology and frameworks
-- Provide specific, actionable recommendations with examples
-- Consider the specific requirements of the role and company when identifying gaps
-- Acknowledge genuine strengths with specific evidence
-- Frame development areas constructively as growth opportunities
-- Reference current market trends and industry expectations
-
-❌ DO NOT:
-- Make assumptions about personality, psychology, or character
-- Provide vague advice like "work on communication" without actionable specifics
-- Focus on soft skills without technical grounding
-- Use discouraging or demotivating language
-- Suggest improvements in areas not relevant to technical/professional development
-- Reference psychological traits, emotional intelligence, or personality frameworks
+    Transient errors are retried only up to this point: once a chunk has been
+    passed on, restarting the stream would repeat it, so later errors propagate.
+    """
+    stream = iter(_get_client().models.generate_content_stream(
+        model=model,
+        contents=[prompt],
+        config=config,
+    ))
+    first = next(stream, None)
+    return stream if first is None else itertools.chain((first,), stream)
 
----
 
-Generate the feedback now, returning ONLY valid JSON matching the CandidateFeedback schema structure.
-"""
+def _stream_feedback(
+    model: str,
+    prompt: str,
+    config: "types.GenerateContentConfig",
+    on_chunk: Optional[Callable[[str], None]] = None,
+) -> CandidateFeedback:
+    """Stream one feedback response and validate the joined text."""
+    # Stream the response so callers can show progress while it is generated
+    buffer = io.StringIO()
+    for chunk in _open_feedback_stream(model, prompt, config):
+        text = chunk.text
+        if not text:
+            continue
+        buffer.write(text)
+        if on_chunk is not None:
+            on_chunk(text)
+
+    response_text = buffer.getvalue()
+    try:
+        return parse_feedback_text(response_text)
+    except Exception as e:
+        print(f"Error parsing LLM output: {e}")
+        print(f"Raw response text: {response_text}")
+        raise
 
-    # -------------------------------
-    # 5️⃣ Call LLM with structured output
-    # -------------------------------
 
-    config = types.GenerateContentConfig(
-        response_mime_type="application/json",
-        response_json_schema=CandidateFeedback.model_json_schema(),
-        temperature=0.2  # Slightly higher than evaluation for more nuanced feedback
+async def generate_candidate_feedback_async(
+    candidate_id: int,
+    evaluation_data: dict,
+    job_requirements: dict,
+    project_root: Path = None,
+    job_context: Optional[str] = None,
+    model_name: str = BULK_FEEDBACK_MODEL,
+    refresh: bool = False,
+) -> CandidateFeedback:
+    """
+    Async variant of generate_candidate_feedback using the client's aio surface.
+    Defaults to BULK_FEEDBACK_MODEL since it serves multi-candidate runs.
+
+    Prompt building reads candidate documents from disk, so it runs in a
+    worker thread to keep the event loop free for other in-flight calls.
+    Identical prompts are answered from memoized feedback unless refresh is
+    True, which always calls the model (and replaces the memoized copy).
+    """
+    client_slot = _client_slot(candidate_id)
+    prompt = await asyncio.to_thread(
+        build_feedback_prompt,
+        candidate_id=candidate_id,
+        evaluation_data=evaluation_data,
+        job_requirements=job_requirements,
+        project_root=project_root,
+        job_context=job_context,
     )
 
-    model_name = "gemini-2.5-flash"
+    # The prompt identifies the request for single-flight/memoization
+    key = cache_key(FEEDBACK_SYSTEM_PROMPT + "\0" + prompt, model_name)
 
-    response = client.models.generate_content(
-        model=model_name,
+    feedback = await _single_flight_feedback(
+        key,
+        project_root,
+        lambda: _request_feedback_async(prompt, client_slot, model_name),
+        refresh=refresh,
+    )
+    # Identical prompts may come from different candidates
+    if feedback.candidate_id != candidate_id:
+        feedback = feedback.model_copy(update={"candidate_id": candidate_id})
+    return feedback
+
+
+async def _request_feedback_async(
+    prompt: str,
+    client_slot: int = 0,
+    model_name: str = BULK_FEEDBACK_MODEL,
+) -> CandidateFeedback:
+    """Issue one async feedback call, retrying once if validation fails."""
+    try:
+        response = await _generate_content_async(
+            client_slot, model_name, prompt, _feedback_config()
+        )
+        return _parse_feedback_response(response)
+    except ValueError as e:
+        retry_config = _validation_retry_config(model_name, e)
+        response = await _generate_content_async(
+            client_slot, FEEDBACK_FALLBACK_MODEL, prompt, retry_config
+        )
+        return _parse_feedback_response(response)
+    finally:
+        _record_feedback_call()
+
+
+@_retry_transient
+async def _generate_content_async(
+    client_slot: int,
+    model: str,
+    prompt: str,
+    config: "types.GenerateContentConfig",
+):
+    """One generate_content call on a region's async client, retried on transient errors."""
+    return await _get_client(client_slot).aio.models.generate_content(
+        model=model,
         contents=[prompt],
         config=config,
     )
 
-    # Parse response
+
+# Completed feedback by prompt key (LRU, also persisted under the LLM cache
+# directory) and in-flight requests, so identical prompts share one call
+_FEEDBACK_MEMO_SIZE = 512
+_feedback_memo: "OrderedDict[str, CandidateFeedback]" = OrderedDict()
+_feedback_inflight: Dict[str, "asyncio.Future"] = {}
+
+
+def _feedback_memo_path(key: str, project_root: Optional[Path]) -> Path:
+    """On-disk location of memoized feedback for a prompt key."""
+    return get_cache_dir(project_root) / "feedback" / f"{key}.json"
+
+
+def _load_feedback_memo(path: Path) -> Optional[CandidateFeedback]:
+    """Return memoized feedback at path, or None if absent/unreadable."""
+    try:
+        return _FEEDBACK_ADAPTER.validate_json(path.read_bytes())
+    except (OSError, ValueError):
+        return None
+
+
+def _store_feedback_memo(path: Path, feedback: CandidateFeedback) -> None:
+    """Persist feedback for later runs."""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(_FEEDBACK_ADAPTER.dump_json(feedback))
+    except OSError:
+        # Persisting is best-effort; the result is still returned
+        pass
+
+
+def _remember_feedback(key: str, feedback: CandidateFeedback) -> None:
+    """Insert into the in-memory LRU, evicting the oldest entry when full."""
+    _feedback_memo[key] = feedback
+    _feedback_memo.move_to_end(key)
+    if len(_feedback_memo) > _FEEDBACK_MEMO_SIZE:
+        _feedback_memo.popitem(last=False)
+
+
+async def _single_flight_feedback(
+    key: str,
+    project_root: Optional[Path],
+    request,
+    refresh: bool = False,
+) -> CandidateFeedback:
+    """
+    Return feedback for `key`, issuing `request()` only if nobody else has.
+
+    Checks the in-memory LRU, then joins an identical in-flight request, then
+    the on-disk copy, and only then calls the model. With refresh, both
+    memoized copies are skipped (and overwritten by the new result); an
+    identical request already in flight is still joined.
+    """
+    feedback = None if refresh else _feedback_memo.get(key)
+    if feedback is not None:
+        _feedback_memo.move_to_end(key)
+        return feedback
+
+    inflight = _feedback_inflight.get(key)
+    if inflight is not None:
+        return await asyncio.shield(inflight)
+
+    future = asyncio.get_running_loop().create_future()
+    _feedback_inflight[key] = future
+    try:
+        memo_path = _feedback_memo_path(key, project_root)
+        feedback = None
+        if not refresh:
+            feedback = await asyncio.to_thread(_load_feedback_memo, memo_path)
+        if feedback is None:
+            feedback = await request()
+            await asyncio.to_thread(_store_feedback_memo, memo_path, feedback)
+        _remember_feedback(key, feedback)
+        future.set_result(feedback)
+        return feedback
+    except BaseException as e:
+        future.set_exception(e)
+        # Mark retrieved so an unobserved failure is not logged twice
+        future.exception()
+        raise
+    finally:
+        _feedback_inflight.pop(key, None)
+
+
+def _parse_feedback_response(response) -> CandidateFeedback:
+    """Convert a generate_content response into CandidateFeedback."""
     try:
         parsed_response = response.parsed
 
         if isinstance(parsed_response, dict):
-            result = CandidateFeedback(**parsed_response)
+            result = _FEEDBACK_ADAPTER.validate_python(parsed_response)
         elif isinstance(parsed_response, CandidateFeedback):
             result = parsed_response
         else:
             # Fallback parsing
-            json_text = response.text.strip()
-            if json_text.startswith('```json'):
-                json_text = json_text.split('```json')[1].split('```')[0].strip()
-            elif json_text.startswith('```'):
-                json_text = json_text.split('```')[1].split('```')[0].strip()
-
-            parsed_dict = json.loads(json_text)
-            result = CandidateFeedback(**parsed_dict)
+            result = parse_feedback_text(response.text)
 
     except Exception as e:
         print(f"Error parsing LLM output: {e}")
@@ -354,20 +730,168 @@ Generate the feedback now, returning ONLY valid JSON matching the CandidateFeedb
     return result
 
 
+def parse_feedback_text(text: str) -> CandidateFeedback:
+    """Parse raw (possibly fenced) JSON response text into CandidateFeedback."""
+    return _FEEDBACK_ADAPTER.validate_json(strip_fence(text))
+
+
 # -------------------------------
 # 6️⃣ Feedback generation helpers
 # -------------------------------
 
 
+def load_feedback_inputs(evaluations_file: Path, requirements_file: Path):
+    """Load the evaluations and job requirements JSON files concurrently."""
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        evaluations_bytes = pool.submit(evaluations_file.read_bytes)
+        requirements_bytes = pool.submit(requirements_file.read_bytes)
+        return orjson.loads(evaluations_bytes.result()), orjson.loads(requirements_bytes.result())
+
+
+_FEEDBACK_FILE_RE = re.compile(r"^candidate_(\d+)_feedback\.json$")
+
+
+def _scan_feedback_files(feedback_dir: Path) -> List[Tuple[int, str]]:
+    """(candidate_id, path) of every per-candidate feedback file, sorted by ID."""
+    if not feedback_dir.exists():
+        return []
+    matches = []
+    with os.scandir(feedback_dir) as it:
+        for entry in it:
+            match = _FEEDBACK_FILE_RE.match(entry.name)
+            if match and entry.is_file():
+                matches.append((int(match.group(1)), entry.path))
+    return sorted(matches)
+
+
+def existing_feedback_ids(feedback_dir: Path) -> set:
+    """IDs of candidates that already have a feedback file."""
+    return {candidate_id for candidate_id, _ in _scan_feedback_files(feedback_dir)}
+
+
+def iter_candidate_feedback(feedback_dir: Path) -> Iterator[Tuple[str, bytes]]:
+    """
+    Yield (candidate_id, raw JSON bytes) for each per-candidate feedback file.
+
+    Files are read one at a time in candidate ID order, so consumers never
+    hold more than one feedback entry in memory.
+    """
+    for candidate_id, path in _scan_feedback_files(feedback_dir):
+        yield str(candidate_id), Path(path).read_bytes()
+
+
+def rebuild_feedback_summary(
+    output_file: Path,
+    feedback_dir: Path,
+    evaluations_data: dict,
+    job_requirements: dict,
+) -> dict:
+    """
+    Rebuild the aggregated feedback JSON from the per-candidate files.
+
+    The per-candidate files are the store of record and generation never
+    touches the summary; it is built only on request (summarize_feedback,
+    --summarize), streamed from the files entry by entry (feedback first,
+    then metadata) into a temporary file that replaces the old summary.
+
+    Returns:
+        The summary metadata
+    """
+    count = 0
+    tmp_file = tempfile.NamedTemporaryFile(
+        dir=output_file.parent,
+        prefix=f"{output_file.name}.",
+        suffix=".tmp",
+        delete=False,
+    )
+    try:
+        with tmp_file as f:
+            f.write(b'{\n  "feedback": {')
+            separator = b"\n"
+            for candidate_key, payload in iter_candidate_feedback(feedback_dir):
+                f.write(separator)
+                f.write(b'    "%s": ' % candidate_key.encode())
+                f.write(payload.strip())
+                separator = b",\n"
+                count += 1
+
+            metadata = {
+                "generation_date": datetime.now().isoformat(),
+                "total_candidates": len(evaluations_data.get("candidates", {})),
+                "feedback_generated_for": count,
+                "job_role": job_requirements.get("company_name", "Unknown"),
+            }
+            f.write(b'\n  },\n  "metadata": ')
+            f.write(orjson.dumps(metadata))
+            f.write(b"\n}\n")
+        replace_file(tmp_file.name, output_file)
+    except BaseException:
+        Path(tmp_file.name).unlink(missing_ok=True)
+        raise
+
+    return metadata
+
+
+def _write_candidate_feedback(feedback_dir: Path, candidate_key: str, feedback: CandidateFeedback) -> Path:
+    """Write one candidate's feedback file and return its path."""
+    individual_file = feedback_dir / f"candidate_{candidate_key}_feedback.json"
+    # Serialized by pydantic-core in one pass, without an intermediate dict
+    individual_file.write_bytes(_FEEDBACK_ADAPTER.dump_json(feedback, indent=2))
+    return individual_file
+
+
+def summarize_feedback(
+    evaluations_file: Path = None,
+    requirements_file: Path = None,
+    output_file: Path = None,
+    project_root: Path = None,
+    feedback_dir: Path = None,
+) -> dict:
+    """
+    Write the aggregated feedback JSON for every per-candidate file in feedback_dir.
+
+    Returns:
+        The summary metadata
+    """
+    if project_root is None:
+        project_root = get_project_root()
+    if evaluations_file is None:
+        evaluations_file = project_root / "data" / "candidate_evaluations.json"
+    if requirements_file is None:
+        requirements_file = project_root / "data" / "job_requirements.json"
+    if feedback_dir is None:
+        feedback_dir = project_root / "data" / "feedback"
+    if output_file is None:
+        output_file = project_root / "data" / "candidate_feedback.json"
+
+    evaluations_data, job_requirements = load_feedback_inputs(evaluations_file, requirements_file)
+    return rebuild_feedback_summary(output_file, feedback_dir, evaluations_data, job_requirements)
+
+
+def save_feedback(feedback_items: Dict[str, CandidateFeedback], feedback_dir: Path) -> None:
+    """Write per-candidate feedback files (the aggregated summary is left untouched)."""
+    # Each file is a single write of an in-memory buffer, issued concurrently
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [
+            pool.submit(_write_candidate_feedback, feedback_dir, candidate_key, feedback)
+            for candidate_key, feedback in feedback_items.items()
+        ]
+        individual_files = [future.result() for future in futures]
+
+    for individual_file in individual_files:
+        print(f"Feedback saved to {individual_file}")
+
+
 def generate_feedback_for_candidate(
     candidate_id: int,
     evaluations_file: Path = None,
     requirements_file: Path = None,
-    output_file: Path = None,
     project_root: Path = None,
     feedback_dir: Path = None,
+    on_chunk: Optional[Callable[[str], None]] = None,
+    model_name: str = FEEDBACK_MODEL,
 ) -> CandidateFeedback:
-    """Generate feedback for a single candidate."""
+    """Generate feedback for a single candidate, passing streamed text to on_chunk."""
     if project_root is None:
         project_root = get_project_root()
 
@@ -379,16 +903,8 @@ def generate_feedback_for_candidate(
     if feedback_dir is None:
         feedback_dir = project_root / "data" / "feedback"
     feedback_dir.mkdir(parents=True, exist_ok=True)
-    individual_file = feedback_dir / f"candidate_{candidate_id}_feedback.json"
 
-    if output_file is None:
-        output_file = project_root / "data" / "candidate_feedback.json"
-
-    with open(evaluations_file, "r") as f:
-        evaluations_data = json.load(f)
-
-    with open(requirements_file, "r") as f:
-        job_requirements = json.load(f)
+    evaluations_data, job_requirements = load_feedback_inputs(evaluations_file, requirements_file)
 
     candidate_key = str(candidate_id)
     candidate_eval = evaluations_data.get("candidates", {}).get(candidate_key)
@@ -404,133 +920,725 @@ def generate_feedback_for_candidate(
         evaluation_data=candidate_eval,
         job_requirements=job_requirements,
         project_root=project_root,
+        on_chunk=on_chunk,
+        model_name=model_name,
     )
 
-    # Load existing feedback file if present
-    if output_file.exists():
-        with open(output_file, "r") as f:
-            feedback_data = json.load(f)
-    else:
-        feedback_data = {
-            "metadata": {
-                "generation_date": datetime.now().isoformat(),
-                "total_candidates": len(evaluations_data.get("candidates", {})),
-                "feedback_generated_for": 0,
-                "job_role": job_requirements.get("company_name", "Unknown"),
-            },
-            "feedback": {},
-        }
+    save_feedback({candidate_key: feedback}, feedback_dir)
+    return feedback
 
-    feedback_data["feedback"][candidate_key] = feedback.model_dump()
-    feedback_data["metadata"]["feedback_generated_for"] = len(feedback_data["feedback"])
-    feedback_data["metadata"]["generation_date"] = datetime.now().isoformat()
 
-    with open(output_file, "w") as f:
-        json.dump(feedback_data, f, indent=2)
+async def generate_feedback_for_candidates(
+    candidate_ids: List[int],
+    evaluations_file: Path = None,
+    requirements_file: Path = None,
+    project_root: Path = None,
+    feedback_dir: Path = None,
+    concurrency: int = 5,
+    model_name: str = BULK_FEEDBACK_MODEL,
+    refresh: bool = False,
+) -> Dict[str, CandidateFeedback]:
+    """
+    Generate feedback for several candidates with concurrent LLM calls.
 
-    with open(individual_file, "w") as f:
-        json.dump(feedback.model_dump(), f, indent=2)
+    At most `concurrency` requests per region are in flight at once to stay
+    within quota. Failures are reported per candidate and do not stop the others.
+    With refresh, memoized feedback for identical prompts is ignored and every
+    candidate gets a new model call.
 
-    print(f"Feedback saved to {individual_file}")
-    return feedback
+    Returns:
+        Dictionary mapping candidate ID (str) to CandidateFeedback
+    """
+    if project_root is None:
+        project_root = get_project_root()
+    if evaluations_file is None:
+        evaluations_file = project_root / "data" / "candidate_evaluations.json"
+    if requirements_file is None:
+        requirements_file = project_root / "data" / "job_requirements.json"
+    if feedback_dir is None:
+        feedback_dir = project_root / "data" / "feedback"
+    feedback_dir.mkdir(parents=True, exist_ok=True)
+
+    evaluations_data, job_requirements = await asyncio.to_thread(
+        load_feedback_inputs, evaluations_file, requirements_file
+    )
+    candidates = evaluations_data.get("candidates", {})
+
+    missing = [cid for cid in candidate_ids if str(cid) not in candidates]
+    if missing:
+        raise ValueError(f"Candidates not found in evaluation file: {missing}")
+
+    print("=" * 80)
+    print(
+        f"Generating feedback for {len(candidate_ids)} candidates "
+        f"(model={model_name}, concurrency={concurrency} x {len(_get_clients())} region(s))"
+    )
+    print("=" * 80)
+
+    job_context = build_job_context(job_requirements)
+    # Candidates are spread across the region pool; each region is throttled
+    # independently since quotas are per region
+    semaphores = [asyncio.Semaphore(concurrency) for _ in _get_clients()]
+
+    # Parse uncached candidate documents (CPU-bound PDF extraction) in worker
+    # processes up front, so parsing overlaps with LLM calls already in flight.
+    # Workers are spawned rather than forked: this process has a running event
+    # loop, thread pools and open HTTP clients that must not be copied.
+    from candidate_profile_evaluator import prefetch_candidate_documents, uncached_candidate_dirs
+
+    candidate_dirs = {
+        cid: project_root / "data" / f"candidate_{cid}" for cid in candidate_ids
+    }
+    uncached_dirs = uncached_candidate_dirs(candidate_dirs.values())
+    pool = None
+    prefetched = {}
+    if uncached_dirs:
+        pool = ProcessPoolExecutor(
+            max_workers=min(len(uncached_dirs), os.cpu_count() or 1),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        prefetched = prefetch_candidate_documents(uncached_dirs, pool, project_root)
+
+    async def generate_one(candidate_id: int) -> CandidateFeedback:
+        future = prefetched.get(str(candidate_dirs[candidate_id]))
+        if future is not None:
+            try:
+                await asyncio.wrap_future(future)
+            except Exception:
+                # Prompt building re-reads the documents and reports the error
+                pass
+        async with semaphores[_client_slot(candidate_id)]:
+            feedback = await generate_candidate_feedback_async(
+                candidate_id=candidate_id,
+                evaluation_data=candidates[str(candidate_id)],
+                job_requirements=job_requirements,
+                project_root=project_root,
+                job_context=job_context,
+                model_name=model_name,
+                refresh=refresh,
+            )
+        # Persist as soon as each candidate completes so an interrupted run
+        # keeps everything finished so far
+        individual_file = await asyncio.to_thread(
+            _write_candidate_feedback, feedback_dir, str(candidate_id), feedback
+        )
+        print(f"  Candidate {candidate_id}: saved to {individual_file}")
+        return feedback
+
+    # Outcomes come back in candidate order; exceptions are returned, not raised
+    try:
+        outcomes = await asyncio.gather(
+            *(generate_one(cid) for cid in candidate_ids), return_exceptions=True
+        )
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+    results = {}
+    for candidate_id, outcome in zip(candidate_ids, outcomes):
+        if isinstance(outcome, BaseException):
+            print(f"  Candidate {candidate_id}: failed ({outcome})")
+        else:
+            results[str(candidate_id)] = outcome
+    print(f"Retried on {FEEDBACK_FALLBACK_MODEL}: {feedback_promotion_rate():.0%} of calls")
+    return results
+
+
+class FeedbackBatcher:
+    """
+    Micro-batch feedback requests that arrive one at a time.
+
+    Requests are queued and dispatched together once `max_batch` are waiting
+    or `max_wait` seconds have passed since the first arrived, whichever comes
+    first. Each batch builds the job context once per
+    job before fanning out, and calls stay bounded by `concurrency` per
+    region. Suits online callers such as the API, where candidates trickle in
+    rather than arriving as one list; start run() as a task before submitting.
+    Cancelling run() cancels every pending request, so no caller is left waiting.
+    Each request is still a single-candidate call, so it defaults to
+    FEEDBACK_MODEL like the CLI; pass BULK_FEEDBACK_MODEL to trade quality
+    for throughput.
+    """
+
+    def __init__(
+        self,
+        project_root: Path = None,
+        max_batch: int = 16,
+        max_wait: float = 0.2,
+        concurrency: int = 5,
+        model_name: str = FEEDBACK_MODEL,
+    ):
+        self.project_root = project_root
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.concurrency = concurrency
+        self.model_name = model_name
+        self._queue: "asyncio.Queue" = asyncio.Queue()
+        self._batches: set = set()
+        self._semaphores: List[asyncio.Semaphore] = []
+        self._closed = False
+
+    async def submit(
+        self,
+        candidate_id: int,
+        evaluation_data: dict,
+        job_requirements: dict,
+        refresh: bool = False,
+    ) -> CandidateFeedback:
+        """Queue one candidate and wait for its feedback; refresh skips memoized feedback."""
+        if self._closed:
+            raise RuntimeError("FeedbackBatcher is shut down")
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((candidate_id, evaluation_data, job_requirements, refresh, future))
+        return await future
+
+    async def run(self) -> None:
+        """Collect and dispatch batches until cancelled."""
+        loop = asyncio.get_running_loop()
+        self._semaphores = [asyncio.Semaphore(self.concurrency) for _ in _get_clients()]
+        batch = []
+        try:
+            while True:
+                batch = [await self._queue.get()]
+                deadline = loop.time() + self.max_wait
+                while len(batch) < self.max_batch:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+                # Batches run as tasks so the next window opens immediately
+                task = asyncio.create_task(self._dispatch(batch))
+                self._batches.add(task)
+                task.add_done_callback(self._batches.discard)
+                batch = []
+        finally:
+            self._closed = True
+            for task in self._batches:
+                task.cancel()
+            # Requests collected or still queued were never dispatched
+            while not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            for *_, future in batch:
+                future.cancel()
+
+    async def _dispatch(self, batch: list) -> None:
+        """Issue every request in a batch concurrently, resolving each caller as it completes."""
+        job_contexts = {}
+        for _, _, job_requirements, _, _ in batch:
+            job_hash = _job_requirements_hash(job_requirements)
+            if job_hash not in job_contexts:
+                job_contexts[job_hash] = build_job_context(job_requirements)
+
+        async def generate_one(candidate_id, evaluation_data, job_requirements, refresh, future):
+            try:
+                async with self._semaphores[_client_slot(candidate_id)]:
+                    feedback = await generate_candidate_feedback_async(
+                        candidate_id=candidate_id,
+                        evaluation_data=evaluation_data,
+                        job_requirements=job_requirements,
+                        project_root=self.project_root,
+                                job_context=job_contexts[_job_requirements_hash(job_requirements)],
+                        model_name=self.model_name,
+                        refresh=refresh,
+                    )
+            except asyncio.CancelledError:
+                future.cancel()
+                raise
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            else:
+                if not future.done():
+                    future.set_result(feedback)
+
+        await asyncio.gather(*(generate_one(*item) for item in batch))
+
+
+def select_rejected_candidates(evaluations_data: dict, num_selected: int = 1) -> List[int]:
+    """
+    Return IDs of candidates outside the top `num_selected` by affinity score.
+
+    Args:
+        evaluations_data: Parsed candidate evaluations file
+        num_selected: Number of top-ranked candidates considered selected
+
+    Returns:
+        Rejected candidate IDs in ascending order
+    """
+    ranked = sorted(
+        evaluations_data.get("candidates", {}).items(),
+        key=lambda item: item[1].get("affinity_score", 0.0),
+        reverse=True,
+    )
+    return sorted(int(candidate_key) for candidate_key, _ in ranked[num_selected:])
+
+
+def generate_feedback_for_rejected_candidates(
+    evaluations_file: Path = None,
+    requirements_file: Path = None,
+    project_root: Path = None,
+    feedback_dir: Path = None,
+    num_selected: int = 1,
+    concurrency: int = 8,
+    use_batch_api: bool = False,
+    gcs_uri: Optional[str] = None,
+    skip_existing: bool = True,
+    model_name: str = BULK_FEEDBACK_MODEL,
+) -> Dict[str, CandidateFeedback]:
+    """
+    Generate feedback for every candidate not among the top `num_selected`.
+
+    Candidates that already have a feedback file in feedback_dir are skipped
+    unless skip_existing is False, so re-running after a crash only issues
+    calls for the missing ones. With skip_existing False, memoized feedback is
+    ignored too, so every rejected candidate gets a new model call.
+
+    By default calls are issued concurrently (bounded by `concurrency`)
+    through generate_feedback_for_candidates. With use_batch_api the whole
+    set is submitted as one batch prediction job (cheaper and not subject to
+    per-minute quotas, but slower to complete), which requires gcs_uri.
+
+    Rejected-candidate runs default to BULK_FEEDBACK_MODEL (flash-lite),
+    roughly halving cost and latency per candidate; pass FEEDBACK_MODEL for
+    more detailed feedback.
+
+    Returns:
+        Dictionary mapping candidate ID (str) to CandidateFeedback
+
+    Raises:
+        ValueError: If use_batch_api is set without gcs_uri
+    """
+    if use_batch_api and not gcs_uri:
+        raise ValueError("gcs_uri is required when use_batch_api is True")
+
+    if project_root is None:
+        project_root = get_project_root()
+    if evaluations_file is None:
+        evaluations_file = project_root / "data" / "candidate_evaluations.json"
+    if feedback_dir is None:
+        feedback_dir = project_root / "data" / "feedback"
+
+    rejected_ids = select_rejected_candidates(
+        orjson.loads(evaluations_file.read_bytes()), num_selected
+    )
+    if skip_existing:
+        done_ids = existing_feedback_ids(feedback_dir)
+        skipped = [cid for cid in rejected_ids if cid in done_ids]
+        if skipped:
+            print(f"Skipping {len(skipped)} candidates with existing feedback")
+        rejected_ids = [cid for cid in rejected_ids if cid not in done_ids]
+    if not rejected_ids:
+        print("No rejected candidates to generate feedback for")
+        return {}
+
+    if use_batch_api:
+        return generate_feedback_batch(
+            candidate_ids=rejected_ids,
+            gcs_uri=gcs_uri,
+            evaluations_file=evaluations_file,
+            requirements_file=requirements_file,
+            project_root=project_root,
+            feedback_dir=feedback_dir,
+            model_name=model_name,
+        )
+
+    return asyncio.run(generate_feedback_for_candidates(
+        candidate_ids=rejected_ids,
+        evaluations_file=evaluations_file,
+        requirements_file=requirements_file,
+        project_root=project_root,
+        feedback_dir=feedback_dir,
+        concurrency=concurrency,
+        model_name=model_name,
+        refresh=not skip_existing,
+    ))
+
+
+# Terminal states of a Vertex batch prediction job
+_BATCH_DONE_STATES = {
+    "JOB_STATE_SUCCEEDED",
+    "JOB_STATE_FAILED",
+    "JOB_STATE_CANCELLED",
+    "JOB_STATE_EXPIRED",
+    "JOB_STATE_PARTIALLY_SUCCEEDED",
+}
+
+
+def _split_gcs_uri(uri: str):
+    """Split gs://bucket/prefix into (bucket, prefix)."""
+    if not uri.startswith("gs://"):
+        raise ValueError(f"Expected a gs:// URI, got: {uri}")
+    bucket, _, prefix = uri[len("gs://"):].partition("/")
+    return bucket, prefix.rstrip("/")
+
+
+def generate_feedback_batch(
+    candidate_ids: List[int],
+    gcs_uri: str,
+    evaluations_file: Path = None,
+    requirements_file: Path = None,
+    project_root: Path = None,
+    feedback_dir: Path = None,
+    poll_interval: float = 30.0,
+    model_name: str = BULK_FEEDBACK_MODEL,
+) -> Dict[str, CandidateFeedback]:
+    """
+    Generate feedback for many candidates with a single batch prediction job.
+
+    All prompts are written to one JSONL file under gcs_uri, submitted as a
+    Vertex AI batch job and the results are read back from the job's output
+    prefix. Batch jobs are billed at a discount and avoid per-request quotas,
+    at the cost of latency, so this suits offline feedback runs.
+
+    Args:
+        candidate_ids: IDs of candidates to generate feedback for
+        gcs_uri: gs://bucket/prefix used for batch input and output
+        evaluations_file: Path to candidate evaluations JSON
+        requirements_file: Path to job requirements JSON
+        project_root: Optional project root path (defaults to auto-detected)
+        feedback_dir: Directory for per-candidate feedback files
+        poll_interval: Seconds between job status checks
+        model_name: Gemini model used for the batch job
+
+    Returns:
+        Dictionary mapping candidate ID (str) to CandidateFeedback
+
+    Raises:
+        ValueError: If a candidate is missing or the batch job does not succeed
+    """
+    # Imported lazily: only the batch path needs Cloud Storage
+    from google.cloud import storage
+    from google.genai import types
+    from settings import get_settings
+
+    if project_root is None:
+        project_root = get_project_root()
+    if evaluations_file is None:
+        evaluations_file = project_root / "data" / "candidate_evaluations.json"
+    if requirements_file is None:
+        requirements_file = project_root / "data" / "job_requirements.json"
+    if feedback_dir is None:
+        feedback_dir = project_root / "data" / "feedback"
+    feedback_dir.mkdir(parents=True, exist_ok=True)
+
+    evaluations_data, job_requirements = load_feedback_inputs(evaluations_file, requirements_file)
+    candidates = evaluations_data.get("candidates", {})
+
+    # Build one request line per candidate; labels carry the ID back in the output
+    job_context = build_job_context(job_requirements)
+    lines = []
+    for candidate_id in candidate_ids:
+        candidate_key = str(candidate_id)
+        candidate_eval = candidates.get(candidate_key)
+        if not candidate_eval:
+            raise ValueError(f"Candidate {candidate_id} not found in evaluation file")
+
+        prompt = build_feedback_prompt(
+            candidate_id=candidate_id,
+            evaluation_data=candidate_eval,
+            job_requirements=job_requirements,
+            project_root=project_root,
+            job_context=job_context,
+        )
+        lines.append(orjson.dumps({
+            "request": {
+                "systemInstruction": {"parts": [{"text": FEEDBACK_SYSTEM_PROMPT}]},
+                "contents": [{"role": "user", "parts": [{"text": prompt}]}],
+                "generationConfig": {
+                    "responseMimeType": "application/json",
+                    "responseJsonSchema": _FEEDBACK_JSON_SCHEMA,
+                    "temperature": _FEEDBACK_TEMPERATURE,
+                },
+                "labels": {"candidate_id": candidate_key},
+            }
+        }))
+
+    bucket_name, prefix = _split_gcs_uri(gcs_uri)
+    run_prefix = f"{prefix}/feedback_{datetime.now().strftime('%Y%m%d_%H%M%S')}".lstrip("/")
+    storage_client = storage.Client(project=get_settings().project_id)
+    bucket = storage_client.bucket(bucket_name)
+    bucket.blob(f"{run_prefix}/input.jsonl").upload_from_string(
+        b"\n".join(lines), content_type="application/jsonl"
+    )
+
+    print("=" * 80)
+    print(f"Submitting batch feedback job for {len(lines)} candidates")
+    print("=" * 80)
+
+    client = _get_client()
+    job = client.batches.create(
+        model=model_name,
+        src=f"gs://{bucket_name}/{run_prefix}/input.jsonl",
+        config=types.CreateBatchJobConfig(dest=f"gs://{bucket_name}/{run_prefix}/output"),
+    )
+    print(f"Batch job: {job.name}")
+
+    while job.state.name not in _BATCH_DONE_STATES:
+        time.sleep(poll_interval)
+        job = client.batches.get(name=job.name)
+        print(f"  state: {job.state.name}")
+
+    if job.state.name not in ("JOB_STATE_SUCCEEDED", "JOB_STATE_PARTIALLY_SUCCEEDED"):
+        raise ValueError(f"Batch job {job.name} ended in state {job.state.name}")
+
+    # Results are written as predictions.jsonl files under the output prefix
+    results: Dict[str, CandidateFeedback] = {}
+    for blob in storage_client.list_blobs(bucket_name, prefix=f"{run_prefix}/output"):
+        if not blob.name.endswith(".jsonl"):
+            continue
+        for line in blob.download_as_text().splitlines():
+            if not line.strip():
+                continue
+            record = orjson.loads(line)
+            candidate_key = record.get("request", {}).get("labels", {}).get("candidate_id")
+            try:
+                parts = record["response"]["candidates"][0]["content"]["parts"]
+                text = "".join(part.get("text", "") for part in parts)
+                results[candidate_key] = parse_feedback_text(text)
+            except Exception as e:
+                print(f"Error parsing batch result for candidate {candidate_key}: {e}")
+                if record.get("status"):
+                    print(f"  status: {record['status']}")
+
+    missing = [str(cid) for cid in candidate_ids if str(cid) not in results]
+    if missing:
+        print(f"No feedback returned for candidates: {', '.join(missing)}")
+
+    save_feedback(results, feedback_dir)
+    return results
 
 
 # -------------------------------
 # 7️⃣ Utility function to format feedback as human-readable text
 # -------------------------------
 
-def format_feedback_as_text(feedback: CandidateFeedback, candidate_id: int = None) -> str:
+_RULE = "=" * 80
+_SUBRULE = "-" * 80
+
+# Report templates, filled with str.format_map; every piece ends in a newline
+# so the report is a single "".join of the filled pieces
+_REPORT_HEAD_TMPL = (
+    _RULE + "\n{header}\n" + _RULE + "\n\n"
+    "PROFILE SUMMARY\n" + _SUBRULE + "\n"
+    "{overall_assessment}\n\n"
+    "Standout Qualities:\n"
+)
+_QUALITY_TMPL = "  • {quality}\n"
+_REPORT_PROFILE_TAIL_TMPL = (
+    "\nCareer Stage: {career_stage_assessment}\n"
+    "Industry Alignment Score: {industry_alignment_score:.2f} / 1.0\n\n\n"
+    "YOUR TECHNICAL STRENGTHS\n" + _SUBRULE + "\n"
+)
+_STRENGTH_TMPL = "{i}. {skill_area} ({proficiency_level})\n   Evidence: {evidence}\n\n"
+_AREAS_HEADER = "\nAREAS FOR IMPROVEMENT\n" + _SUBRULE + "\n"
+_AREA_TMPL = (
+    "{i}. {dimension}\n"
+    "   Current Gap: {current_gap}\n"
+    "   Why It Matters: {importance_context}\n"
+    "   Timeline: {estimated_timeline}\n\n"
+    "   Actionable Recommendations:\n"
+)
+_RECOMMENDATION_TMPL = "      • {rec}\n"
+_REPORT_FOOTER_TMPL = (
+    "\nRECOMMENDED NEXT STEPS\n" + _SUBRULE + "\n"
+    "{next_steps_summary}\n\n" + _RULE + "\n"
+)
+
+
+def write_feedback_report(
+    feedback: CandidateFeedback,
+    out: TextIO,
+    candidate_id: int = None,
+) -> None:
     """
-    Format CandidateFeedback object as human-readable text for email or display.
+    Write the human-readable feedback report to a text stream.
+
+    Pieces go straight to `out`, so a report can be streamed to a file or
+    email body without building the whole string first.
 
     Args:
         feedback: CandidateFeedback object
+        out: Writable text stream (file, sys.stdout, io.StringIO, ...)
         candidate_id: Optional candidate ID to include in the header
-
-    Returns:
-        Formatted text string
     """
-    header = f"CANDIDATE FEEDBACK REPORT"
+    header = "CANDIDATE FEEDBACK REPORT"
     if candidate_id:
         header += f" - Candidate #{candidate_id}"
 
-    lines = [
-        "=" * 80,
-        header,
-        "=" * 80,
-        "",
-        "PROFILE SUMMARY",
-        "-" * 80,
-        feedback.profile_summary.overall_assessment,
-        "",
-        "Standout Qualities:",
-        *[f"  • {quality}" for quality in feedback.profile_summary.standout_qualities],
-        "",
-        f"Career Stage: {feedback.profile_summary.career_stage_assessment}",
-        f"Industry Alignment Score: {feedback.industry_alignment_score:.2f} / 1.0",
-        "",
-        "",
-        "YOUR TECHNICAL STRENGTHS",
-        "-" * 80,
-    ]
+    summary = feedback.profile_summary
+    out.write(_REPORT_HEAD_TMPL.format_map({
+        "header": header,
+        "overall_assessment": summary.overall_assessment,
+    }))
+    out.writelines(_QUALITY_TMPL.format_map({"quality": q}) for q in summary.standout_qualities)
+    out.write(_REPORT_PROFILE_TAIL_TMPL.format_map({
+        "career_stage_assessment": summary.career_stage_assessment,
+        "industry_alignment_score": feedback.industry_alignment_score,
+    }))
+
+    out.writelines(
+        _STRENGTH_TMPL.format_map({
+            "i": i,
+            "skill_area": strength.skill_area,
+            "proficiency_level": strength.proficiency_level,
+            "evidence": strength.evidence,
+        })
+        for i, strength in enumerate(feedback.technical_strengths, 1)
+    )
 
-    for i, strength in enumerate(feedback.technical_strengths, 1):
-        lines.extend([
-            f"{i}. {strength.skill_area} ({strength.proficiency_level})",
-            f"   Evidence: {strength.evidence}",
-            ""
-        ])
+    out.write(_AREAS_HEADER)
+    for i, area in enumerate(feedback.improvement_areas, 1):
+        out.write(_AREA_TMPL.format_map({
+            "i": i,
+            "dimension": area.dimension,
+            "current_gap": area.current_gap,
+            "importance_context": area.importance_context,
+            "estimated_timeline": area.estimated_timeline,
+        }))
+        out.writelines(_RECOMMENDATION_TMPL.format_map({"rec": rec}) for rec in area.actionable_recommendations)
+        out.write("\n")
 
-    lines.extend([
-        "",
-        "AREAS FOR IMPROVEMENT",
-        "-" * 80,
-    ])
+    out.write(_REPORT_FOOTER_TMPL.format_map({"next_steps_summary": feedback.next_steps_summary}))
 
-    for i, area in enumerate(feedback.improvement_areas, 1):
-        lines.extend([
-            f"{i}. {area.dimension}",
-            f"   Current Gap: {area.current_gap}",
-            f"   Why It Matters: {area.importance_context}",
-            f"   Timeline: {area.estimated_timeline}",
-            "",
-            "   Actionable Recommendations:",
-            *[f"      • {rec}" for rec in area.actionable_recommendations],
-            ""
-        ])
-
-    lines.extend([
-        "",
-        "RECOMMENDED NEXT STEPS",
-        "-" * 80,
-        feedback.next_steps_summary,
-        "",
-        "=" * 80,
-        ""
-    ])
-
-    return "\n".join(lines)
+
+def format_feedback_as_text(feedback: CandidateFeedback, candidate_id: int = None) -> str:
+    """
+    Format CandidateFeedback object as human-readable text for email or display.
+
+    Args:
+        feedback: CandidateFeedback object
+        candidate_id: Optional candidate ID to include in the header
+
+    Returns:
+        Formatted text string
+    """
+    buffer = io.StringIO()
+    write_feedback_report(feedback, buffer, candidate_id)
+    return buffer.getvalue()
 
 
 if __name__ == "__main__":
-    parser = argparse.ArgumentParser(description="Generate feedback for a single candidate")
-    parser.add_argument("candidate_id", type=int, help="Candidate ID")
+    parser = argparse.ArgumentParser(description="Generate feedback for one or more candidates")
+    parser.add_argument("candidate_ids", type=int, nargs="*", help="Candidate ID(s)")
+    parser.add_argument(
+        "--rejected",
+        action="store_true",
+        help="Generate feedback for every candidate outside the top --num-selected",
+    )
+    parser.add_argument(
+        "--num-selected",
+        type=int,
+        default=1,
+        help="Number of top-ranked candidates treated as selected with --rejected (default: 1)",
+    )
+    parser.add_argument(
+        "--regenerate",
+        action="store_true",
+        help=(
+            "Regenerate feedback even for candidates that already have it, "
+            "bypassing memoized responses"
+        ),
+    )
     parser.add_argument("--evaluations-file", default=None)
     parser.add_argument("--requirements-file", default=None)
+    parser.add_argument(
+        "--summarize",
+        action="store_true",
+        help="Rebuild the aggregated summary (--output-summary) from the per-candidate files",
+    )
     parser.add_argument("--output-summary", default=None)
     parser.add_argument("--feedback-dir", default=None)
-
-    args = parser.parse_args()
-
-    feedback = generate_feedback_for_candidate(
-        candidate_id=args.candidate_id,
-        evaluations_file=Path(args.evaluations_file) if args.evaluations_file else None,
-        requirements_file=Path(args.requirements_file) if args.requirements_file else None,
-        output_file=Path(args.output_summary) if args.output_summary else None,
-        feedback_dir=Path(args.feedback_dir) if args.feedback_dir else None,
+    parser.add_argument(
+        "--gcs-uri",
+        default=None,
+        help="gs://bucket/prefix; submit all candidates as one batch prediction job",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=5,
+        help="Maximum concurrent LLM calls per region when generating feedback for multiple candidates (default: 5)",
+    )
+    parser.add_argument(
+        "--model",
+        default=None,
+        help=(
+            f"Gemini model (default: {FEEDBACK_MODEL} for a single candidate, "
+            f"{BULK_FEEDBACK_MODEL} for multiple candidates)"
+        ),
     )
 
-    print("\n" + "=" * 80)
-    print("FORMATTED FEEDBACK REPORT")
-    print("=" * 80 + "\n")
-    print(format_feedback_as_text(feedback, args.candidate_id))
+    args = parser.parse_args()
+    model_kwargs = {"model_name": args.model} if args.model else {}
+
+    evaluations_file = Path(args.evaluations_file) if args.evaluations_file else None
+    requirements_file = Path(args.requirements_file) if args.requirements_file else None
+    output_file = Path(args.output_summary) if args.output_summary else None
+    feedback_dir = Path(args.feedback_dir) if args.feedback_dir else None
+
+    if args.rejected:
+        results = generate_feedback_for_rejected_candidates(
+            evaluations_file=evaluations_file,
+            requirements_file=requirements_file,
+            feedback_dir=feedback_dir,
+            num_selected=args.num_selected,
+            concurrency=args.concurrency,
+            use_batch_api=bool(args.gcs_uri),
+            gcs_uri=args.gcs_uri,
+            skip_existing=not args.regenerate,
+            **model_kwargs,
+        )
+        print(f"\nGenerated feedback for {len(results)} rejected candidates")
+    elif not args.candidate_ids:
+        if not args.summarize:
+            parser.error("provide candidate ID(s), --rejected or --summarize")
+    elif args.gcs_uri:
+        results = generate_feedback_batch(
+            candidate_ids=args.candidate_ids,
+            gcs_uri=args.gcs_uri,
+            evaluations_file=evaluations_file,
+            requirements_file=requirements_file,
+            feedback_dir=feedback_dir,
+            **model_kwargs,
+        )
+        print(f"\nGenerated feedback for {len(results)} of {len(args.candidate_ids)} candidates")
+    elif len(args.candidate_ids) > 1:
+        results = asyncio.run(generate_feedback_for_candidates(
+            candidate_ids=args.candidate_ids,
+            evaluations_file=evaluations_file,
+            requirements_file=requirements_file,
+            feedback_dir=feedback_dir,
+            concurrency=args.concurrency,
+            refresh=args.regenerate,
+            **model_kwargs,
+        ))
+        print(f"\nGenerated feedback for {len(results)} of {len(args.candidate_ids)} candidates")
+    else:
+        candidate_id = args.candidate_ids[0]
+        feedback = generate_feedback_for_candidate(
+            candidate_id=candidate_id,
+            evaluations_file=evaluations_file,
+            requirements_file=requirements_file,
+            feedback_dir=feedback_dir,
+            # Echo raw tokens to stderr as they arrive so progress is visible
+            on_chunk=lambda text: (sys.stderr.write(text), sys.stderr.flush()),
+            **model_kwargs,
+        )
+        sys.stderr.write("\n")
+
+        print("\n" + "=" * 80)
+        print("FORMATTED FEEDBACK REPORT")
+        print("=" * 80 + "\n")
+        write_feedback_report(feedback, sys.stdout, candidate_id)
+        print()
+
+    if args.summarize:
+        metadata = summarize_feedback(
+            evaluations_file=evaluations_file,
+            requirements_file=requirements_file,
+            output_file=output_file,
+            feedback_dir=feedback_dir,
+        )
+        print(f"Feedback summary written for {metadata['feedback_generated_for']} candidates")
@@ -4,18 +4,31 @@ Profile Agent Module
 Evaluates individual candidates against job requirements using LLM.
 """
 
+import io
 import os
-import json
+import re
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from functools import lru_cache, partial
 from pathlib import Path
+
+import orjson
 from dotenv import load_dotenv
 from pydantic import BaseModel, Field
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 
 # New import for genai types
 from google import genai
 from google.genai import types 
 import PyPDF2
 
+from llm_cache import get_cache_root
+from llm_http import client_http_options, retry_transient
+from llm_json import loads_json, strip_fence
+from llm_prompt import truncate_middle
+
 # -------------------------------
 # 1️⃣ Pydantic models for output
 # -------------------------------
@@ -29,6 +42,16 @@ class CandidateEvaluation(BaseModel):
     feature_scores: List[FeatureScore] = Field(description="A list of scores for each required feature.")
     affinity_score: float = Field(description="The weighted average of the feature scores.")
 
+# The LLM only returns feature scores; affinity_score is computed locally
+class EvaluationResponse(BaseModel):
+    feature_scores: List[FeatureScore] = Field(description="A list of scores for each required feature.")
+
+class IdentifiedEvaluationResponse(EvaluationResponse):
+    candidate_id: int = Field(description="The ID of the evaluated candidate, as given in the prompt.")
+
+class BatchEvaluation(BaseModel):
+    evaluations: List[IdentifiedEvaluationResponse] = Field(description="One evaluation per candidate in the prompt.")
+
 # -------------------------------
 # 2️⃣ Load environment variables and Initialize Client
 # -------------------------------
@@ -43,34 +66,94 @@ LOCATION = os.getenv("GOOGLE_CLOUD_LOCATION", "us-central1")
 # Initialize Vertex AI client (or use genai.Client() for the Gemini API)
 # Using 'genai.Client()' without arguments will look for GOOGLE_API_KEY, 
 # but since you are using GOOGLE_CLOUD_PROJECT/LOCATION, the Vertex AI client is appropriate.
+# One client, and so one keep-alive connection pool, is shared by every
+# evaluation thread
 client = genai.Client(
     vertexai=True,
     project=PROJECT_ID,
-    location=LOCATION
+    location=LOCATION,
+    http_options=client_http_options(),
 )
 
+# Gemini model used for candidate scoring (Vertex AI)
+EVALUATION_MODEL = "gemini-2.5-flash"
+
+# Generation configs for JSON output based on the Pydantic models; the schemas
+# never change, so both are built once at import
+_EVALUATION_CONFIG = types.GenerateContentConfig(
+    response_mime_type="application/json",
+    response_json_schema=EvaluationResponse.model_json_schema(),
+    # Low temperature for more deterministic scoring
+    temperature=0.0
+)
+_BATCH_EVALUATION_CONFIG = types.GenerateContentConfig(
+    response_mime_type="application/json",
+    response_json_schema=BatchEvaluation.model_json_schema(),
+    temperature=0.0
+)
+
+@retry_transient(max_attempts=6)
+def _generate(model: str, prompt: str, config: types.GenerateContentConfig):
+    """Call Gemini, backing off with jitter on 429 and 5xx responses."""
+    return client.models.generate_content(
+        model=model,
+        contents=[prompt],
+        config=config,
+    )
+
+@lru_cache(maxsize=1)
 def get_project_root() -> Path:
     """Get the project root directory."""
     return Path(__file__).parent.parent
 
 
-def load_pdf_text(file_path: Path) -> str:
+def _pdf_text_cache_dir(project_root: Optional[Path] = None) -> Path:
+    """Directory of extracted PDF text, keyed by file content hash."""
+    if project_root is None:
+        project_root = get_project_root()
+    return get_cache_root(project_root) / "pdf_text"
+
+
+def _extract_pdf_text(data: bytes) -> str:
+    """Extract the text of every page of an in-memory PDF."""
+    reader = PyPDF2.PdfReader(io.BytesIO(data))
+    # One join over the pages instead of repeated string concatenation
+    return "\n".join(page.extract_text() or "" for page in reader.pages).strip()
+
+
+def load_pdf_text(file_path: Path, project_root: Optional[Path] = None) -> str:
     """
     Extract text from a PDF file.
     
+    Extraction is cached on disk under .cache/pdf_text keyed by a hash of the
+    file's bytes, so unchanged PDFs cost one read and hash instead of a full
+    PyPDF2 parse on later runs.
+    
     Args:
         file_path: Path to the PDF file
+        project_root: Optional project root holding the cache (defaults to auto-detected)
         
     Returns:
         Extracted text from the PDF
     """
     try:
-        text = ""
-        with open(file_path, "rb") as f:
-            reader = PyPDF2.PdfReader(f)
-            for page in reader.pages:
-                text += page.extract_text() + "\n"
-        return text.strip()
+        data = file_path.read_bytes()
+        cache_file = _pdf_text_cache_dir(project_root) / f"{hashlib.blake2b(data, digest_size=16).hexdigest()}.txt"
+        try:
+            return cache_file.read_text(encoding='utf-8')
+        except OSError:
+            pass
+        
+        text = _extract_pdf_text(data)
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_file.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp_path.write_text(text, encoding='utf-8')
+            os.replace(tmp_path, cache_file)
+        except OSError:
+            # Caching is best-effort; the text is still returned
+            pass
+        return text
     except Exception as e:
         return f"Error reading PDF {file_path.name}: {str(e)}"
 
@@ -86,9 +169,8 @@ def load_json_text(file_path: Path) -> str:
         Formatted JSON text
     """
     try:
-        with open(file_path, "r", encoding='utf-8') as f:
-            data = json.load(f)
-        return json.dumps(data, indent=2)
+        data = loads_json(file_path.read_bytes())
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
     except Exception as e:
         return f"Error reading JSON {file_path.name}: {str(e)}"
 
@@ -111,12 +193,40 @@ def load_text_file(file_path: Path) -> str:
         return f"Error reading text file {file_path.name}: {str(e)}"
 
 
-def scan_candidate_documents(candidate_dir: Path) -> Dict[str, List]:
+# Supported extensions -> (loader, documents key, type label)
+_HANDLERS = {
+    '.pdf': (load_pdf_text, 'pdfs', 'PDF'),
+    '.json': (load_json_text, 'jsons', 'JSON'),
+    '.txt': (load_text_file, 'texts', 'TEXT'),
+    '.md': (load_text_file, 'texts', 'TEXT'),
+    '.rtf': (load_text_file, 'texts', 'TEXT'),
+}
+
+
+def _load_document(file_path: Path, project_root: Optional[Path] = None) -> Optional[Tuple[str, str, str]]:
+    """
+    Load one candidate file by extension.
+    
+    Returns:
+        Tuple of (documents key, type label, content), or None for unsupported files
+    """
+    handler = _HANDLERS.get(file_path.suffix.lower())
+    if handler is None:
+        return None
+    load_fn, category, doc_type = handler
+    if load_fn is load_pdf_text:
+        # Only extracted PDF text is cached, under the caller's project root
+        return category, doc_type, load_pdf_text(file_path, project_root)
+    return category, doc_type, load_fn(file_path)
+
+
+def scan_candidate_documents(candidate_dir: Path, project_root: Optional[Path] = None) -> Dict[str, List]:
     """
     Scan candidate directory for all documents and load their content.
     
     Args:
         candidate_dir: Path to the candidate directory
+        project_root: Optional project root for the PDF text cache (defaults to auto-detected)
         
     Returns:
         Dictionary mapping document types to their content lists.
@@ -133,61 +243,82 @@ def scan_candidate_documents(candidate_dir: Path) -> Dict[str, List]:
     if not candidate_dir.exists():
         return documents
     
-    # Scan for all files in the directory
-    for file_path in candidate_dir.iterdir():
-        if not file_path.is_file():
+    # Only supported files are handed to the loader pool
+    file_paths = [
+        file_path for file_path in candidate_dir.iterdir()
+        if file_path.suffix.lower() in _HANDLERS and file_path.is_file()
+    ]
+    
+    # Files are independent, so load them concurrently to overlap disk reads
+    # and parsing; results come back in directory order
+    if len(file_paths) > 1:
+        with ThreadPoolExecutor(max_workers=min(len(file_paths), 8)) as executor:
+            loaded = list(executor.map(partial(_load_document, project_root=project_root), file_paths))
+    else:
+        loaded = [_load_document(file_path, project_root) for file_path in file_paths]
+    
+    for file_path, result in zip(file_paths, loaded):
+        if result is None:
             continue
-            
-        file_name = file_path.name.lower()
-        
-        # Process PDF files
-        if file_path.suffix.lower() == '.pdf':
-            content = load_pdf_text(file_path)
-            documents['pdfs'].append({
-                'filename': file_path.name,
-                'content': content
-            })
-            documents['all_content'].append({
-                'filename': file_path.name,
-                'type': 'PDF',
-                'content': content
-            })
-        
-        # Process JSON files
-        elif file_path.suffix.lower() == '.json':
-            content = load_json_text(file_path)
-            documents['jsons'].append({
-                'filename': file_path.name,
-                'content': content
-            })
-            documents['all_content'].append({
-                'filename': file_path.name,
-                'type': 'JSON',
-                'content': content
-            })
-        
-        # Process text files
-        elif file_path.suffix.lower() in ['.txt', '.md', '.rtf']:
-            content = load_text_file(file_path)
-            documents['texts'].append({
-                'filename': file_path.name,
-                'content': content
-            })
-            documents['all_content'].append({
-                'filename': file_path.name,
-                'type': 'TEXT',
-                'content': content
-            })
+        category, doc_type, content = result
+        documents[category].append({
+            'filename': file_path.name,
+            'content': content
+        })
+        documents['all_content'].append({
+            'filename': file_path.name,
+            'type': doc_type,
+            'content': content
+        })
     
     return documents
 
 
-def format_candidate_information(documents: Dict[str, str]) -> str:
+# Section headings of the formatted candidate information, in output order
+_DOCUMENT_SECTIONS = (
+    ('pdfs', "=== PDF Documents (CVs, Resumes, etc.) ==="),
+    ('jsons', "=== JSON Documents (LinkedIn, Portfolio, etc.) ==="),
+    ('texts', "=== Text Documents ==="),
+)
+
+
+# Caps on document text sent to the LLM (~4 characters per token). Longer
+# documents keep their head and tail, since CVs carry relevant content at both ends
+MAX_CHARS_PER_DOC = 24000
+MAX_TOTAL_CHARS = 80000
+
+# Ragged whitespace left by PDF extraction: runs of spaces/tabs and of blank lines
+_INLINE_SPACE_RE = re.compile(r"[ \t\f\v]+")
+_BLANK_LINES_RE = re.compile(r"\n\s*\n\s*\n+")
+
+
+def _doc_budgets(lengths: List[int], max_total_chars: int) -> List[int]:
+    """Split max_total_chars across documents; short ones keep everything, long ones share the rest."""
+    budgets = [0] * len(lengths)
+    remaining = max_total_chars
+    pending = len(lengths)
+    for i in sorted(range(len(lengths)), key=lengths.__getitem__):
+        budgets[i] = min(lengths[i], remaining // pending)
+        remaining -= budgets[i]
+        pending -= 1
+    return budgets
+
+
+def format_candidate_information(documents: Dict[str, str],
+                                 max_chars_per_doc: int = MAX_CHARS_PER_DOC,
+                                 max_total_chars: int = MAX_TOTAL_CHARS) -> str:
     """
     Format all candidate documents into a single text string for the LLM.
     
+    Whitespace runs in PDF and text documents are collapsed (JSON documents
+    keep the indentation load_json_text gave them), and documents over
+    max_chars_per_doc (or over their share of max_total_chars) are cut down
+    to their head and tail.
+    
     Args:
         documents: Dictionary of scanned documents
+        max_chars_per_doc: Maximum characters kept from any one document
+        max_total_chars: Maximum characters kept across all documents
         
     Returns:
         Formatted text containing all candidate information
@@ -195,33 +326,223 @@ def format_candidate_information(documents: Dict[str, str]) -> str:
     if not documents['all_content']:
         return "No candidate documents found in the directory."
     
-    formatted_sections = []
+    sections = [(key, title, documents[key]) for key, title in _DOCUMENT_SECTIONS if documents[key]]
+    contents = [
+        doc['content'] if key == 'jsons'
+        else _BLANK_LINES_RE.sub("\n\n", _INLINE_SPACE_RE.sub(" ", doc['content']))
+        for key, _, docs in sections
+        for doc in docs
+    ]
+    budgets = _doc_budgets([len(content) for content in contents], max_total_chars)
+    contents = iter([
+        truncate_middle(content, min(budget, max_chars_per_doc))
+        for content, budget in zip(contents, budgets)
+    ])
     
-    # Add PDFs section
-    if documents['pdfs']:
-        formatted_sections.append("=== PDF Documents (CVs, Resumes, etc.) ===")
-        for pdf in documents['pdfs']:
-            formatted_sections.append(f"\n--- {pdf['filename']} ---\n{pdf['content']}")
-        formatted_sections.append("")
+    # Write straight into one buffer rather than building each document's
+    # section string first
+    buffer = io.StringIO()
+    for _, title, docs in sections:
+        if buffer.tell():
+            buffer.write("\n")
+        buffer.write(title)
+        for doc in docs:
+            buffer.write("\n\n--- ")
+            buffer.write(doc['filename'])
+            buffer.write(" ---\n")
+            buffer.write(next(contents))
+        buffer.write("\n")
     
-    # Add JSONs section
-    if documents['jsons']:
-        formatted_sections.append("=== JSON Documents (LinkedIn, Portfolio, etc.) ===")
-        for json_file in documents['jsons']:
-            formatted_sections.append(f"\n--- {json_file['filename']} ---\n{json_file['content']}")
-        formatted_sections.append("")
+    return buffer.getvalue()
+
+
+def directory_state(candidate_dir: Path) -> tuple:
+    """
+    (name, mtime_ns, size) of every file in a directory, used to detect changes.
+
+    Keys both the documents cache here and the evaluation cache in
+    candidate_evaluator, so the two always agree on when a candidate changed.
+    """
+    if not candidate_dir.exists():
+        return ()
+    entries = []
+    for f in candidate_dir.iterdir():
+        if f.is_file():
+            stat = f.stat()
+            entries.append((f.name, stat.st_mtime_ns, stat.st_size))
+    return tuple(sorted(entries))
+
+
+# Scanned and formatted documents keyed by (directory, file state), LRU-bounded
+_DOCUMENTS_CACHE: "OrderedDict[tuple, tuple]" = OrderedDict()
+_DOCUMENTS_CACHE_SIZE = 256
+_DOCUMENTS_CACHE_LOCK = threading.Lock()
+
+
+def _scan_and_format(candidate_dir: str, project_root: Optional[Path] = None):
+    """Scan and format candidate_dir (module-level so worker processes can run it)."""
+    documents = scan_candidate_documents(Path(candidate_dir), project_root)
+    return documents, format_candidate_information(documents)
+
+
+def _documents_cache_key(candidate_dir: Path) -> tuple:
+    """Cache key: directory path plus the current state of its files."""
+    return (str(candidate_dir), directory_state(candidate_dir))
+
+
+def _get_cached_documents(key: tuple):
+    """Return cached (documents, formatted text) for key, or None."""
+    with _DOCUMENTS_CACHE_LOCK:
+        cached = _DOCUMENTS_CACHE.get(key)
+        if cached is not None:
+            _DOCUMENTS_CACHE.move_to_end(key)
+        return cached
+
+
+def _store_cached_documents(key: tuple, result: tuple) -> None:
+    """Insert into the documents cache, evicting the oldest entry when full."""
+    with _DOCUMENTS_CACHE_LOCK:
+        _DOCUMENTS_CACHE[key] = result
+        if len(_DOCUMENTS_CACHE) > _DOCUMENTS_CACHE_SIZE:
+            _DOCUMENTS_CACHE.popitem(last=False)
+
+
+def load_candidate_documents(candidate_dir: Path, project_root: Optional[Path] = None):
+    """
+    Scan and format a candidate directory, reusing the result while its files are unchanged.
+
+    Evaluation and feedback generation read the same documents; keying on the
+    directory state (file names, mtimes and sizes) lets them share one parse
+    per process. The returned documents dict is shared and must not be mutated.
+
+    Args:
+        candidate_dir: Path to the candidate directory
+        project_root: Optional project root for the PDF text cache (defaults to auto-detected)
+
+    Returns:
+        Tuple of (documents as returned by scan_candidate_documents,
+        formatted text from format_candidate_information)
+    """
+    key = _documents_cache_key(candidate_dir)
+    cached = _get_cached_documents(key)
+    if cached is None:
+        cached = _scan_and_format(str(candidate_dir), project_root)
+        _store_cached_documents(key, cached)
+    return cached
+
+
+def uncached_candidate_dirs(candidate_dirs) -> List[Path]:
+    """Return the candidate directories whose current contents are not in the documents cache."""
+    return [
+        Path(candidate_dir) for candidate_dir in candidate_dirs
+        if _get_cached_documents(_documents_cache_key(candidate_dir)) is None
+    ]
+
+
+def _store_prefetched_documents(key: tuple, future: Future) -> None:
+    """Done-callback adding a prefetch result to the documents cache."""
+    # Futures cancelled at executor shutdown have no result to store
+    if not future.cancelled() and future.exception() is None:
+        _store_cached_documents(key, future.result())
+
+
+def prefetch_candidate_documents(candidate_dirs, executor: Executor,
+                                 project_root: Optional[Path] = None) -> Dict[str, Future]:
+    """
+    Start parsing uncached candidate directories on `executor`.
+
+    PDF text extraction is CPU-bound, so with a ProcessPoolExecutor several
+    candidates are parsed in parallel while the caller waits on the network.
+    Each result is added to the documents cache as soon as it completes, so a
+    later load_candidate_documents call for that directory is a cache hit.
+
+    Args:
+        candidate_dirs: Candidate directory paths
+        executor: Executor to run the parsing on
+        project_root: Optional project root for the PDF text cache (defaults to auto-detected)
+
+    Returns:
+        Dictionary mapping str(candidate_dir) to its Future, for directories
+        that were not already cached
+    """
+    futures = {}
+    for candidate_dir in candidate_dirs:
+        key = _documents_cache_key(candidate_dir)
+        if _get_cached_documents(key) is not None:
+            continue
+        future = executor.submit(_scan_and_format, key[0], project_root)
+        future.add_done_callback(partial(_store_prefetched_documents, key))
+        futures[key[0]] = future
+    return futures
+
+
+def format_requirements(requirements: dict) -> str:
+    """Serialize requirements for the evaluation prompt."""
+    return orjson.dumps(requirements, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+
+
+def requirement_weights(requirements: dict) -> Dict[str, float]:
+    """Feature name -> weight from a requirements dict ({"features": [{"name", "weight"}, ...]})."""
+    return {
+        feature["name"]: float(feature["weight"])
+        for feature in requirements.get("features", [])
+    }
+
+
+def _feature_key(name: str) -> str:
+    """Normalize a feature name for matching LLM output against the requirements."""
+    return " ".join(name.split()).casefold()
+
+
+def build_evaluation(feature_scores: List[FeatureScore],
+                     weights: Dict[str, float]) -> CandidateEvaluation:
+    """
+    Build a CandidateEvaluation, computing affinity_score as the weighted
+    average of the feature scores (0.0 if the total weight is zero).
     
-    # Add text files section
-    if documents['texts']:
-        formatted_sections.append("=== Text Documents ===")
-        for text_file in documents['texts']:
-            formatted_sections.append(f"\n--- {text_file['filename']} ---\n{text_file['content']}")
-        formatted_sections.append("")
+    The average is computed here rather than by the LLM so it is exact and
+    deterministic, and costs no output tokens. Weights come from the
+    requirements, matched by feature name (ignoring case and spacing), not
+    from the weights the LLM echoes back; scored features that are not in the
+    requirements are dropped with a warning.
     
-    return "\n".join(formatted_sections)
+    Args:
+        feature_scores: Feature scores returned by the LLM
+        weights: Feature name -> weight, as returned by requirement_weights
+    """
+    names = {_feature_key(name): name for name in weights}
+    scored = []
+    total_weight = 0.0
+    weighted_sum = 0.0
+    for feature in feature_scores:
+        name = names.get(_feature_key(feature.name))
+        if name is None:
+            print(f"Warning: ignoring score for unknown feature '{feature.name}'")
+            continue
+        weight = weights[name]
+        scored.append(FeatureScore(name=name, weight=weight, score=feature.score))
+        total_weight += weight
+        weighted_sum += weight * feature.score
+    return CandidateEvaluation(
+        feature_scores=scored,
+        affinity_score=weighted_sum / total_weight if total_weight else 0.0,
+    )
 
 
-def evaluate_candidate(ID: int, requirements: dict, project_root: Path = None) -> CandidateEvaluation:
+def _document_summary(documents: Dict[str, List]) -> str:
+    """Describe the documents found for a candidate, e.g. "1 PDF document(s), 2 text document(s)"."""
+    doc_summary = []
+    if documents['pdfs']:
+        doc_summary.append(f"{len(documents['pdfs'])} PDF document(s)")
+    if documents['jsons']:
+        doc_summary.append(f"{len(documents['jsons'])} JSON document(s)")
+    if documents['texts']:
+        doc_summary.append(f"{len(documents['texts'])} text document(s)")
+    return ", ".join(doc_summary)
+
+
+def evaluate_candidate(ID: int, requirements: dict, project_root: Path = None,
+                       requirements_json: Optional[str] = None) -> CandidateEvaluation:
     """
     Evaluate a single candidate against job requirements.
     Analyzes all available documents in the candidate's folder.
@@ -230,6 +551,8 @@ def evaluate_candidate(ID: int, requirements: dict, project_root: Path = None) -
         ID: Candidate ID
         requirements: Dictionary containing requirements with features and weights
         project_root: Optional project root path (defaults to auto-detected)
+        requirements_json: Optional pre-serialized requirements (as produced by
+            format_requirements) so batch callers serialize them only once
         
     Returns:
         CandidateEvaluation object with feature scores and affinity score
@@ -242,8 +565,8 @@ def evaluate_candidate(ID: int, requirements: dict, project_root: Path = None) -
     
     candidate_dir = project_root / "data" / f"candidate_{ID}"
     
-    # Scan for all documents in the candidate directory
-    documents = scan_candidate_documents(candidate_dir)
+    # Scan and format all documents in the candidate directory (cached while unchanged)
+    documents, combined_text = load_candidate_documents(candidate_dir, project_root)
     
     # Check if any documents were found
     if not documents['all_content']:
@@ -252,19 +575,11 @@ def evaluate_candidate(ID: int, requirements: dict, project_root: Path = None) -
             f"Please ensure the directory contains at least one document (PDF, JSON, or text file)."
         )
     
-    # Format all documents into a single text string
-    combined_text = format_candidate_information(documents)
-    
     # Create document summary for the prompt
-    doc_summary = []
-    if documents['pdfs']:
-        doc_summary.append(f"{len(documents['pdfs'])} PDF document(s)")
-    if documents['jsons']:
-        doc_summary.append(f"{len(documents['jsons'])} JSON document(s)")
-    if documents['texts']:
-        doc_summary.append(f"{len(documents['texts'])} text document(s)")
-    document_summary = ", ".join(doc_summary)
+    document_summary = _document_summary(documents)
 
+    if requirements_json is None:
+        requirements_json = format_requirements(requirements)
 
     # --- Define prompt ---
     prompt = (
@@ -272,78 +587,172 @@ def evaluate_candidate(ID: int, requirements: dict, project_root: Path = None) -
         "Analyze the following candidate information from all available documents and evaluate against the provided requirements. "
         f"The candidate information is compiled from {document_summary} found in their directory. "
         "For each feature in the requirements, assign a score between 0.0 and 1.0 representing how well the candidate matches it. "
-        "Consider all available information from CVs, resumes, LinkedIn profiles, portfolios, or any other documents provided. "
-        "Finally, compute the weighted average of the scores for the 'affinity_score'."
+        "Consider all available information from CVs, resumes, LinkedIn profiles, portfolios, or any other documents provided."
         f"\n\nCandidate Information:\n{combined_text}"
-        f"\n\nRequirements:\n{json.dumps(requirements, indent=2)}"
+        f"\n\nRequirements:\n{requirements_json}"
     )
 
     # --- Call the LLM with structured output config ---
     
-    # Define the generation configuration for JSON output based on the Pydantic model
-    config = types.GenerateContentConfig(
-        response_mime_type="application/json",
-        response_json_schema=CandidateEvaluation.model_json_schema(), # Use the Pydantic model schema
-        # Optional: Set a low temperature for more deterministic scoring
-        temperature=0.0
-    )
-
-    # Use a Gemini model appropriate for Vertex AI
-    model_name = "gemini-2.5-flash" 
-
-    response = client.models.generate_content(
-        model=model_name,
-        contents=[prompt],
-        config=config,
-    )
+    response = _generate(EVALUATION_MODEL, prompt, _EVALUATION_CONFIG)
     
     # --- Parse with Pydantic (handled automatically by client, available in .parsed) ---
+    # Dispatch once on the parsed type; only fall back to the raw text when
+    # the client did not parse it, letting pydantic-core decode the JSON
+    parsed_response = response.parsed
     try:
-        # The genai client may return a dict or a Pydantic model
-        parsed_response = response.parsed
-        
-        # Convert to Pydantic model if it's a dict
-        if isinstance(parsed_response, dict):
-            # Convert dict to Pydantic model
-            result = CandidateEvaluation(**parsed_response)
-        elif isinstance(parsed_response, CandidateEvaluation):
-            # Already a Pydantic model
+        if isinstance(parsed_response, EvaluationResponse):
             result = parsed_response
+        elif isinstance(parsed_response, dict):
+            result = EvaluationResponse.model_validate(parsed_response)
         else:
-            # Try to parse from JSON text if parsed is not working
-            try:
-                json_text = response.text.strip()
-                # Remove markdown code blocks if present
-                if json_text.startswith('```json'):
-                    json_text = json_text.split('```json')[1].split('```')[0].strip()
-                elif json_text.startswith('```'):
-                    json_text = json_text.split('```')[1].split('```')[0].strip()
-                
-                parsed_dict = json.loads(json_text)
-                result = CandidateEvaluation(**parsed_dict)
-            except Exception as json_error:
-                print(f"Error parsing JSON from response text: {json_error}")
-                print(f"Raw response text: {response.text}")
-                raise
-                
+            result = EvaluationResponse.model_validate_json(strip_fence(response.text))
     except Exception as e:
         print(f"Error parsing LLM output: {e}")
-        print(f"Response type: {type(response.parsed)}")
+        print(f"Response type: {type(parsed_response)}")
         print(f"Raw response text: {response.text}")
-        # Try fallback: parse from text
+        raise
+
+    return build_evaluation(result.feature_scores, requirement_weights(requirements))
+
+def evaluate_candidate_batch(candidate_ids: List[int], requirements: dict,
+                             project_root: Path = None,
+                             requirements_json: Optional[str] = None
+                             ) -> Tuple[Dict[int, CandidateEvaluation], Dict[int, Exception]]:
+    """
+    Evaluate several candidates with a single LLM call.
+    
+    Failures are reported per candidate rather than failing the batch:
+    candidates without documents are left out of the prompt, and candidates
+    the model drops from its response are re-evaluated individually with
+    evaluate_candidate.
+    
+    Args:
+        candidate_ids: Candidate IDs to evaluate together
+        requirements: Dictionary containing requirements with features and weights
+        project_root: Optional project root path (defaults to auto-detected)
+        requirements_json: Optional pre-serialized requirements (as produced by
+            format_requirements) so batch callers serialize them only once
+        
+    Returns:
+        Tuple of (candidate ID -> evaluation, candidate ID -> error) covering
+        every requested candidate
+    """
+    if project_root is None:
+        project_root = get_project_root()
+    if requirements_json is None:
+        requirements_json = format_requirements(requirements)
+    
+    errors: Dict[int, Exception] = {}
+    sections = []
+    included = []
+    for candidate_id in candidate_ids:
+        candidate_dir = project_root / "data" / f"candidate_{candidate_id}"
+        try:
+            documents, combined_text = load_candidate_documents(candidate_dir, project_root)
+        except Exception as e:
+            errors[candidate_id] = e
+            continue
+        if not documents['all_content']:
+            errors[candidate_id] = ValueError(f"No documents found in candidate directory: {candidate_dir}")
+            continue
+        included.append(candidate_id)
+        sections.append(
+            f"### Candidate id={candidate_id} "
+            f"(compiled from {_document_summary(documents)}):\n{combined_text}"
+        )
+
+    results: Dict[int, CandidateEvaluation] = {}
+    if included:
+        prompt = (
+            "You are an expert technical recruiter. "
+            f"Evaluate each of the following {len(included)} candidates independently against the provided requirements, "
+            "using all information from their documents (CVs, resumes, LinkedIn profiles, portfolios, etc.). "
+            "For each candidate and each feature in the requirements, assign a score between 0.0 and 1.0 representing how well the candidate matches it. "
+            "Return one evaluation per candidate, tagged with the candidate's id."
+            f"\n\nRequirements:\n{requirements_json}"
+            "\n\n" + "\n\n".join(sections)
+        )
+
         try:
-            json_text = response.text.strip()
-            if json_text.startswith('```json'):
-                json_text = json_text.split('```json')[1].split('```')[0].strip()
-            elif json_text.startswith('```'):
-                json_text = json_text.split('```')[1].split('```')[0].strip()
-            parsed_dict = json.loads(json_text)
-            result = CandidateEvaluation(**parsed_dict)
-        except Exception as fallback_error:
-            print(f"Fallback parsing also failed: {fallback_error}")
-            raise e
-
-    return result
+            response = _generate(EVALUATION_MODEL, prompt, _BATCH_EVALUATION_CONFIG)
+            parsed_response = response.parsed
+            if isinstance(parsed_response, BatchEvaluation):
+                batch = parsed_response
+            elif isinstance(parsed_response, dict):
+                batch = BatchEvaluation.model_validate(parsed_response)
+            else:
+                batch = BatchEvaluation.model_validate_json(strip_fence(response.text))
+        except Exception as e:
+            for candidate_id in included:
+                errors[candidate_id] = e
+            return results, errors
+
+        weights = requirement_weights(requirements)
+        requested = set(included)
+        for evaluation in batch.evaluations:
+            if evaluation.candidate_id in requested:
+                results[evaluation.candidate_id] = build_evaluation(evaluation.feature_scores, weights)
+
+    for candidate_id in included:
+        if candidate_id not in results:
+            try:
+                results[candidate_id] = evaluate_candidate(
+                    candidate_id, requirements, project_root=project_root,
+                    requirements_json=requirements_json,
+                )
+            except Exception as e:
+                errors[candidate_id] = e
+
+    return results, errors
+
+
+def evaluate_candidates_batched(candidate_ids: List[int], requirements: dict,
+                                project_root: Path = None, batch_size: int = 8,
+                                max_workers: int = 4
+                                ) -> Tuple[Dict[int, CandidateEvaluation], Dict[int, Exception]]:
+    """
+    Evaluate candidates with one LLM call per batch of `batch_size` candidates.
+    
+    Packing several candidates into one prompt sends the requirements once per
+    batch instead of once per candidate and pays the per-request overhead once,
+    which sustains higher throughput than one call per candidate once rate
+    limits bind. Batches of 4-16 work well; larger batches raise per-call
+    latency and the risk of the model dropping a candidate.
+    
+    Args:
+        candidate_ids: Candidate IDs to evaluate
+        requirements: Dictionary containing requirements with features and weights
+        project_root: Optional project root path (defaults to auto-detected)
+        batch_size: Number of candidates per LLM call
+        max_workers: Number of batches evaluated concurrently
+        
+    Returns:
+        Tuple of (candidate ID -> evaluation, candidate ID -> error), each in
+        input order; see evaluate_candidate_batch
+    """
+    if project_root is None:
+        project_root = get_project_root()
+    requirements_json = format_requirements(requirements)
+
+    batches = [
+        candidate_ids[i:i + batch_size]
+        for i in range(0, len(candidate_ids), batch_size)
+    ]
+    results: Dict[int, CandidateEvaluation] = {}
+    errors: Dict[int, Exception] = {}
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(batches)))) as executor:
+        for batch_results, batch_errors in executor.map(
+            lambda batch: evaluate_candidate_batch(batch, requirements, project_root, requirements_json),
+            batches,
+        ):
+            results.update(batch_results)
+            errors.update(batch_errors)
+
+    return (
+        {candidate_id: results[candidate_id] for candidate_id in candidate_ids if candidate_id in results},
+        {candidate_id: errors[candidate_id] for candidate_id in candidate_ids if candidate_id in errors},
+    )
 
 if __name__ == "__main__":
     requirements = {
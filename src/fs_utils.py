@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Filesystem Helpers Module
+Atomic replacement of user-facing output files written through a temporary
+file.
+"""
+
+import os
+from pathlib import Path
+from typing import Union
+
+
+def _current_umask() -> int:
+    """Read the process umask (it can only be read by setting it)."""
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+# Mode a plain open() gives a new file. Read once at import, before any worker
+# threads exist, since reading the umask briefly changes it process-wide.
+DEFAULT_FILE_MODE = 0o666 & ~_current_umask()
+
+
+def replace_file(tmp_path: Union[str, Path], destination: Union[str, Path]) -> None:
+    """
+    Atomically move a finished temporary file onto its destination.
+
+    tempfile creates files with mode 0600 and os.replace keeps it, so the
+    temporary file first gets the mode a plain open() would have given the
+    output.
+    """
+    os.chmod(tmp_path, DEFAULT_FILE_MODE)
+    os.replace(tmp_path, destination)
@@ -12,27 +12,48 @@ Run with:
     uvicorn job_api:app --reload
 """
 
-import os
 import re
-import json
+import copy
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional
-from urllib.parse import urlparse
+from typing import Dict, List, Optional, Tuple
 
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
-from dotenv import load_dotenv
 from google import genai
 from fastapi import FastAPI
 from fastapi import HTTPException
 from pydantic import BaseModel
 
-# Load environment variables
-load_dotenv()
+# Ensure sibling modules are importable when running as a script
+import sys
+_SRC_DIR = str(Path(__file__).parent)
+if _SRC_DIR not in sys.path:
+    sys.path.insert(0, _SRC_DIR)
+
+from llm_cache import get_cache_root, get_or_generate
+from llm_json import loads_json, strip_fence
+from llm_prompt import truncate_middle
+from settings import get_settings
+
+# Configuration is read from the environment once, at import
+SETTINGS = get_settings()
 
 # Configure Google Cloud Project
-PROJECT_ID = os.getenv("GOOGLE_CLOUD_PROJECT")
-LOCATION = os.getenv("GOOGLE_CLOUD_LOCATION", "us-central1")
+PROJECT_ID = SETTINGS.project_id
+LOCATION = SETTINGS.location
+
+# Seconds a scraped job description stays valid in the on-disk cache
+SCRAPE_CACHE_TTL = SETTINGS.scrape_ttl
+
+# Maximum job description length (characters) sent to the LLM
+MAX_DESC_CHARS = SETTINGS.max_desc_chars
 
 if not PROJECT_ID or PROJECT_ID == "your-project-id-here":
     raise ValueError("Please set GOOGLE_CLOUD_PROJECT in .env file with your actual GCP project ID")
@@ -67,12 +88,81 @@ def health_check() -> Dict[str, str]:
 # SCRAPER
 # ---------------------------------------------------------------------------
 
+# Shared HTTP session so repeated scrapes reuse keep-alive connections
+# instead of paying a new TCP/TLS handshake per job URL.
+_SESSION = requests.Session()
+_SESSION.headers.update({
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+})
+_ADAPTER = HTTPAdapter(max_retries=0, pool_connections=20, pool_maxsize=100)
+
+# (connect, read) timeouts in seconds; keeps one slow posting from holding a worker
+_SCRAPE_TIMEOUT = (3.05, 7)
+_SESSION.mount('http://', _ADAPTER)
+_SESSION.mount('https://', _ADAPTER)
+
+
+def close_session() -> None:
+    """Close the pooled HTTP session (called on API shutdown)."""
+    _SESSION.close()
 
+
+def warm_up_client() -> None:
+    """Issue a cheap Vertex AI request so auth/TLS setup happens before the first analysis."""
+    try:
+        next(iter(client.models.list(config={"page_size": 1})), None)
+    except Exception:
+        # Warm-up is best-effort; real requests will surface any error
+        pass
+
+
+@lru_cache(maxsize=1)
 def get_project_root() -> Path:
     """Get the project root directory."""
     return Path(__file__).parent.parent
 
 
+# Accepted job posting URLs: http(s) scheme followed by a host
+_URL_RE = re.compile(r'^https?://[^/\s]+(/.*)?$')
+
+# Runs of three or more newlines collapsed while cleaning scraped text
+_BLANK_LINES_RE = re.compile(r'\n{3,}')
+
+# Elements stripped before extracting text
+_UNWANTED_TAGS = ('script', 'style', 'nav', 'footer', 'header')
+
+# Common job description containers as (attribute, value), in priority order
+_JOB_SELECTORS = (
+    ('class', 'job-description'),
+    ('class', 'description'),
+    ('id', 'job-description'),
+    ('class', 'posting-description'),
+    ('class', 'job-details'),
+    ('role', 'article'),
+    ('class', 'content'),
+)
+
+
+def _matches_selector(tag, attr: str, value: str) -> bool:
+    """Check a tag against one (attribute, value) selector."""
+    if attr == 'class':
+        return value in (tag.get('class') or ())
+    return tag.get(attr) == value
+
+
+def _is_job_container(tag) -> bool:
+    """Predicate for div/section tags matching any job selector."""
+    return tag.name in ('div', 'section') and any(
+        _matches_selector(tag, attr, value) for attr, value in _JOB_SELECTORS
+    )
+
+
+# In-memory LRU in front of the on-disk scrape cache: url -> (fetched at, text)
+_SCRAPE_CACHE: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+_SCRAPE_CACHE_SIZE = 128
+_SCRAPE_CACHE_LOCK = threading.Lock()
+
+
 def scrape_job_description(url: str) -> str:
     """
     Scrape job description text from a URL.
@@ -87,55 +177,97 @@ def scrape_job_description(url: str) -> str:
         ValueError: If URL is invalid or scraping fails
     """
     # Validate URL
+    if not _URL_RE.match(url):
+        raise ValueError("Invalid URL: Invalid URL format")
+
+    with _SCRAPE_CACHE_LOCK:
+        entry = _SCRAPE_CACHE.get(url)
+        if entry is not None:
+            if time.time() - entry[0] <= SCRAPE_CACHE_TTL:
+                _SCRAPE_CACHE.move_to_end(url)
+                return entry[1]
+            del _SCRAPE_CACHE[url]
+
+    cache_path = _scrape_cache_path(url)
+    entry = _read_scrape_cache(cache_path)
+    if entry is None:
+        entry = (time.time(), _fetch_job_description(url))
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            cache_path.write_text(entry[1], encoding='utf-8')
+        except OSError:
+            # Caching is best-effort; never fail a scrape because of it
+            pass
+
+    with _SCRAPE_CACHE_LOCK:
+        _SCRAPE_CACHE[url] = entry
+        _SCRAPE_CACHE.move_to_end(url)
+        if len(_SCRAPE_CACHE) > _SCRAPE_CACHE_SIZE:
+            _SCRAPE_CACHE.popitem(last=False)
+    return entry[1]
+
+
+def _scrape_cache_path(url: str) -> Path:
+    """Return the on-disk cache file for a job URL."""
+    url_hash = hashlib.sha1(url.encode('utf-8')).hexdigest()
+    return get_cache_root(get_project_root()) / "scrape" / f"{url_hash}.txt"
+
+
+def _read_scrape_cache(cache_path: Path) -> Optional[Tuple[float, str]]:
+    """
+    Return (fetched at, job text) if cached on disk and younger than
+    SCRAPE_CACHE_TTL. Expired files are removed so the directory does not
+    keep every URL ever scraped.
+    """
     try:
-        parsed = urlparse(url)
-        if not parsed.scheme or not parsed.netloc:
-            raise ValueError("Invalid URL format")
-    except Exception as e:
-        raise ValueError(f"Invalid URL: {e}")
+        fetched_at = cache_path.stat().st_mtime
+        if time.time() - fetched_at > SCRAPE_CACHE_TTL:
+            cache_path.unlink(missing_ok=True)
+            return None
+        return fetched_at, cache_path.read_text(encoding='utf-8')
+    except OSError:
+        return None
 
-    try:
-        # Fetch page with a proper user agent
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
 
-        response = requests.get(url, headers=headers, timeout=10)
+def _fetch_job_description(url: str) -> str:
+    """Download and extract the job description text from a URL."""
+    try:
+        # Fetch page through the pooled session (carries the user agent)
+        response = _SESSION.get(url, timeout=_SCRAPE_TIMEOUT)
         response.raise_for_status()
 
-        # Parse HTML
-        soup = BeautifulSoup(response.content, 'html.parser')
+        # Parse HTML (lxml parses in C, much faster than html.parser)
+        soup = BeautifulSoup(response.content, 'lxml')
 
         # Remove unwanted elements
-        for element in soup(['script', 'style', 'nav', 'footer', 'header']):
+        for element in soup.find_all(_UNWANTED_TAGS):
             element.decompose()
 
-        # Try to find job description container (common selectors)
-        job_selectors = [
-            {'class': 'job-description'},
-            {'class': 'description'},
-            {'id': 'job-description'},
-            {'class': 'posting-description'},
-            {'class': 'job-details'},
-            {'role': 'article'},
-            {'class': 'content'},
-        ]
+        # Collect every candidate container in a single tree walk, then try
+        # the selectors in priority order (div before section for each one)
+        containers = soup.find_all(_is_job_container)
 
         job_text = None
-
-        # Try each selector
-        for selector in job_selectors:
-            container = soup.find('div', selector) or soup.find('section', selector)
+        short_text = None
+
+        # Try each selector, stopping at the first viable description
+        for attr, value in _JOB_SELECTORS:
+            matching = [tag for tag in containers if _matches_selector(tag, attr, value)]
+            container = next(
+                (tag for tag in matching if tag.name == 'div'),
+                matching[0] if matching else None,
+            )
             if container:
-                job_text = container.get_text(separator='\n', strip=True)
-                if len(job_text) > 100:  # Minimum viable description
+                text = container.get_text(separator='\n', strip=True)
+                if len(text) > 100:  # Minimum viable description
+                    job_text = text
                     break
+                short_text = text
 
-        # Fallback: get main content or body
-        if not job_text or len(job_text) < 100:
+        # Fallback: get main content or body, only when no selector matched well
+        if job_text is None:
             main = soup.find('main') or soup.find('article') or soup.find('body')
-            if main:
-                job_text = main.get_text(separator='\n', strip=True)
+            job_text = main.get_text(separator='\n', strip=True) if main else short_text
 
         if not job_text:
             raise ValueError("Could not extract job description from page")
@@ -145,10 +277,12 @@ def scrape_job_description(url: str) -> str:
         cleaned_text = '\n'.join(lines)
 
         # Remove excessive whitespace
-        cleaned_text = re.sub(r'\n{3,}', '\n\n', cleaned_text)
+        cleaned_text = _BLANK_LINES_RE.sub('\n\n', cleaned_text)
 
         return cleaned_text
 
+    except requests.Timeout as e:
+        raise ValueError(f"Timeout fetching URL: {e}")
     except requests.RequestException as e:
         raise ValueError(f"Failed to fetch URL: {e}")
     except Exception as e:
@@ -160,8 +294,32 @@ def scrape_job_description(url: str) -> str:
 # LLM-BASED FEATURE EXTRACTION
 # ---------------------------------------------------------------------------
 
-def extract_features_with_weights(job_description: str, company: str, n: int = 5) -> Dict:
-    """Extract N technical + N behavioral features and assign weights using LLM."""
+# Only empty or near-empty scrapes (a blank page, a lone title) are rejected;
+# short but real postings are still analyzed
+MIN_DESC_CHARS = 20
+
+
+def _check_description_length(job_description: str) -> None:
+    """Reject degenerate descriptions (e.g. dead pages) before calling the LLM."""
+    if len(job_description.strip()) < MIN_DESC_CHARS:
+        raise ValueError(
+            f"Job description too short to analyze ({len(job_description.strip())} chars, "
+            f"minimum {MIN_DESC_CHARS})"
+        )
+
+
+def extract_features_with_weights(job_description: str, company: str, n: int = 5,
+                                  disable_cache: bool = False) -> Dict:
+    """Extract N technical + N behavioral features and assign weights using LLM.
+
+    Responses are cached on disk by (model, prompt); pass ``disable_cache=True``
+    to force a fresh call.
+
+    Raises:
+        ValueError: If the description is shorter than MIN_DESC_CHARS
+    """
+    _check_description_length(job_description)
+    job_description = truncate_middle(job_description, MAX_DESC_CHARS)
     prompt = f"""
     You are an expert recruiter and organizational psychologist.
 
@@ -177,7 +335,6 @@ def extract_features_with_weights(job_description: str, company: str, n: int = 5
 
     {{
     "company": "{company}",
-    "job_description": "<<FULL JOB TEXT>>",
     "features": ["Python", "Team Collaboration", ...],
     "weights": [1.0, 0.8, ...],
     "types": ["technical", "behavioral", ...]
@@ -190,21 +347,122 @@ def extract_features_with_weights(job_description: str, company: str, n: int = 5
     {job_description}
     """
     try:
-        response = client.models.generate_content(
-            model="gemini-2.0-flash-exp",
-            contents=prompt,
+        response_text = get_or_generate(
+            client,
+            prompt,
+            "gemini-2.0-flash-exp",
+            disable_cache=disable_cache,
         )
-        text = re.sub(r"^```(json)?|```$", "", response.text.strip()).strip()
-        result = json.loads(text)
+        result = loads_json(strip_fence(response_text))
         return result
     except Exception as e:
         raise RuntimeError(f"LLM error: {e}")
 
 
+def extract_features_for_jobs(job_descriptions: List[str], company: str, n: int = 5,
+                              disable_cache: bool = False) -> List[Dict]:
+    """Extract features and weights for several job descriptions in one LLM call.
+
+    Returns one result per job description, in the same order, each with the
+    structure produced by ``extract_features_with_weights``.
+    """
+    if not job_descriptions:
+        return []
+    for description in job_descriptions:
+        _check_description_length(description)
+
+    jobs_text = "\n\n".join(
+        f"=== Job Description {i} ===\n{truncate_middle(description, MAX_DESC_CHARS)}"
+        for i, description in enumerate(job_descriptions, 1)
+    )
+    prompt = f"""
+    You are an expert recruiter and organizational psychologist.
+
+    Analyze each of the following {len(job_descriptions)} job descriptions and the company context.
+
+    For EACH job description, extract:
+    - The top {n} *technical* skills or competencies (languages, frameworks, tools, domain knowledge).
+    - The top {n} *behavioral or psychological* characteristics (soft skills, personality traits, mindset).
+
+    Then assign an *importance weight* between 0.0 and 1.0 for each feature, representing how critical it is for success in that role.
+
+    Return ONLY a valid JSON array with exactly one object per job description, in the same order:
+
+    [
+    {{
+    "company": "{company}",
+    "features": ["Python", "Team Collaboration", ...],
+    "weights": [1.0, 0.8, ...],
+    "types": ["technical", "behavioral", ...]
+    }},
+    ...
+    ]
+
+    Within each object the arrays must be of the same length.
+    Do not include any text, comments, or explanations outside the JSON array.
+
+    {jobs_text}
+    """
+    try:
+        response_text = get_or_generate(
+            client,
+            prompt,
+            "gemini-2.0-flash-exp",
+            disable_cache=disable_cache,
+        )
+        results = loads_json(strip_fence(response_text))
+    except Exception as e:
+        raise RuntimeError(f"LLM error: {e}")
+
+    if not isinstance(results, list) or len(results) != len(job_descriptions):
+        raise RuntimeError(
+            f"LLM error: expected {len(job_descriptions)} results, got {results!r:.200}"
+        )
+    return results
+
+
 # ---------------------------------------------------------------------------
 # GLOBAL FUNCTION FOR DIRECT USE
 # ---------------------------------------------------------------------------
 
+# In-memory LRU of LLM extraction results keyed by (company, n, description)
+_ANALYSIS_CACHE: "OrderedDict[str, Dict]" = OrderedDict()
+_ANALYSIS_CACHE_SIZE = 128
+_ANALYSIS_CACHE_LOCK = threading.Lock()
+
+
+def _attach_source(result: Dict, url: str, job_description: str) -> Dict:
+    """Add the source URL, original description and weights_dict to a result."""
+    result["url"] = url
+    result["job_description"] = job_description
+
+    # Create a convenience dictionary mapping feature names to weights
+    result["weights_dict"] = {
+        feature: weight
+        for feature, weight in zip(result.get("features", []), result.get("weights", []))
+    }
+    return result
+
+
+def _analyze_description(job_description: str, company: str, n: int, url: str) -> Dict:
+    """Shared core of analyze_job and analyze_job_from_url, memoized per description."""
+    key = hashlib.sha256(f"{company}\0{n}\0{job_description}".encode('utf-8')).hexdigest()
+    with _ANALYSIS_CACHE_LOCK:
+        cached = _ANALYSIS_CACHE.get(key)
+        if cached is not None:
+            _ANALYSIS_CACHE.move_to_end(key)
+
+    if cached is None:
+        cached = extract_features_with_weights(job_description, company, n)
+        with _ANALYSIS_CACHE_LOCK:
+            _ANALYSIS_CACHE[key] = cached
+            if len(_ANALYSIS_CACHE) > _ANALYSIS_CACHE_SIZE:
+                _ANALYSIS_CACHE.popitem(last=False)
+
+    # Callers mutate the result (saved_path, ...), so hand out a copy
+    return _attach_source(copy.deepcopy(cached), url, job_description)
+
+
 def analyze_job_from_url(
     url: str,
     company: str,
@@ -233,18 +491,7 @@ def analyze_job_from_url(
         }
     """
     job_description = scrape_job_description(url)
-    result = extract_features_with_weights(job_description, company, n)
-    
-    # Add URL and original job description to result
-    result["url"] = url
-    result["job_description"] = job_description
-    
-    # Create a convenience dictionary mapping feature names to weights
-    weights_dict = {
-        feature: weight 
-        for feature, weight in zip(result.get("features", []), result.get("weights", []))
-    }
-    result["weights_dict"] = weights_dict
+    result = _analyze_description(job_description, company, n, url=url)
     
     # Persist results if requested
     if output_file is None:
@@ -271,18 +518,27 @@ def analyze_job(job_description: str, company: str, n: int = 5) -> Dict:
     Returns:
         Dictionary with the same structure as analyze_job_from_url
     """
-    result = extract_features_with_weights(job_description, company, n)
-    result["url"] = "text_input"
-    result["job_description"] = job_description
-    
-    # Create a convenience dictionary mapping feature names to weights
-    weights_dict = {
-        feature: weight 
-        for feature, weight in zip(result.get("features", []), result.get("weights", []))
-    }
-    result["weights_dict"] = weights_dict
-    
-    return result
+    return _analyze_description(job_description, company, n, url="text_input")
+
+
+def analyze_jobs(urls: List[str], job_descriptions: List[str], company: str,
+                 n: int = 5) -> List[Dict]:
+    """
+    Analyze several already-scraped job descriptions with a single LLM call.
+
+    Args:
+        urls: Source URL of each job description
+        job_descriptions: Job description texts, aligned with ``urls``
+        company: Company name
+        n: Number of technical and behavioral features to extract (default: 5)
+
+    Returns:
+        List of dictionaries with the same structure as analyze_job_from_url
+    """
+    results = extract_features_for_jobs(job_descriptions, company, n)
+    for url, job_description, result in zip(urls, job_descriptions, results):
+        _attach_source(result, url, job_description)
+    return results
 
 
 # ---------------------------------------------------------------------------
@@ -310,8 +566,8 @@ def save_job_analysis(result: Dict, output_file: str = "data/job_requirements.js
     # Ensure output directory exists
     output_path.parent.mkdir(parents=True, exist_ok=True)
     
-    with open(output_path, 'w') as f:
-        json.dump(result, f, indent=2)
+    with open(output_path, 'wb') as f:
+        f.write(orjson.dumps(result, option=orjson.OPT_INDENT_2))
     
     return output_path
 
@@ -341,8 +597,7 @@ def load_job_analysis(input_file: str = "data/job_requirements.json",
             f"Please run job analysis first to generate the file."
         )
     
-    with open(input_path, 'r') as f:
-        result = json.load(f)
+    result = orjson.loads(input_path.read_bytes())
     
     # Ensure weights_dict exists for backward compatibility
     if "weights_dict" not in result:
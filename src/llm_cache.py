@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+LLM Response Cache Module
+Persists Gemini responses on disk keyed by (model, prompt) so repeated
+analyses of the same input skip the remote call.
+"""
+
+import hashlib
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+import orjson
+
+
+@lru_cache(maxsize=1)
+def get_project_root() -> Path:
+    """Get the project root directory."""
+    return Path(__file__).parent.parent
+
+
+def get_cache_root(project_root: Optional[Path] = None) -> Path:
+    """Return the (gitignored) .cache directory every on-disk cache lives under."""
+    if project_root is None:
+        project_root = get_project_root()
+    return project_root / ".cache"
+
+
+def get_cache_dir(project_root: Optional[Path] = None) -> Path:
+    """Return the directory holding cached LLM responses."""
+    return get_cache_root(project_root) / "llm"
+
+
+def cache_key(prompt: str, model: str) -> str:
+    """Build the cache key for a prompt/model pair."""
+    return hashlib.sha256((model + "\0" + prompt).encode("utf-8")).hexdigest()
+
+
+def get_or_generate(
+    client,
+    prompt: str,
+    model: str,
+    disable_cache: bool = False,
+    project_root: Optional[Path] = None,
+) -> str:
+    """
+    Return the response text for a prompt, calling the LLM only on a cache miss.
+
+    Args:
+        client: google-genai client used on a cache miss
+        prompt: Prompt sent to the model
+        model: Model name
+        disable_cache: If True, always call the model and do not read the cache
+        project_root: Optional project root path (defaults to auto-detected)
+
+    Returns:
+        Raw response text from the model
+    """
+    cache_file = get_cache_dir(project_root) / f"{cache_key(prompt, model)}.json"
+
+    if not disable_cache and cache_file.exists():
+        try:
+            return orjson.loads(cache_file.read_bytes())["text"]
+        except (OSError, ValueError, KeyError):
+            pass
+
+    response = client.models.generate_content(
+        model=model,
+        contents=prompt,
+    )
+    text = response.text or ""
+
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        cache_file.write_bytes(orjson.dumps({"model": model, "text": text}))
+    except OSError:
+        # Caching is best-effort; the response is still returned
+        pass
+
+    return text
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+LLM HTTP Helpers Module
+Connection pool sizing and retry policy shared by the Gemini clients of the
+candidate evaluator and the feedback generator.
+"""
+
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential_jitter
+
+# Connection pool for a client's sync and async HTTP transports; keep-alive
+# slots cover the default worker counts so concurrent calls reuse connections
+# instead of re-handshaking TLS
+HTTP_MAX_CONNECTIONS = 64
+HTTP_MAX_KEEPALIVE = 32
+
+# Rate limiting (429) and transient server errors; anything else is not retried
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+def client_http_options():
+    """HttpOptions giving a genai.Client the shared connection pool limits."""
+    import httpx
+    from google.genai import types
+
+    limits = httpx.Limits(
+        max_connections=HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+    )
+    return types.HttpOptions(
+        client_args={"limits": limits},
+        async_client_args={"limits": limits},
+    )
+
+
+def is_retryable_api_error(exc: BaseException) -> bool:
+    """True for API errors worth retrying (google.genai errors carry the HTTP status in .code)."""
+    return getattr(exc, "code", None) in RETRYABLE_STATUS_CODES
+
+
+def retry_transient(max_attempts: int):
+    """Decorator retrying transient API errors with exponential backoff and jitter."""
+    return retry(
+        retry=retry_if_exception(is_retryable_api_error),
+        stop=stop_after_attempt(max_attempts),
+        wait=wait_exponential_jitter(initial=1, max=30),
+        reraise=True,
+    )
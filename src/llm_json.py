@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""
+LLM JSON Helpers Module
+Extracts and parses the JSON answers returned by Gemini, which are sometimes
+wrapped in markdown code fences.
+"""
+
+import json
+import re
+
+import orjson
+
+# Markdown code fence (optionally tagged json) the model sometimes wraps
+# around its JSON answer; a missing closing fence is tolerated
+_FENCE_RE = re.compile(r"```(?:json)?\s*(.*?)\s*(?:```|$)", re.S)
+
+
+def strip_fence(text: str) -> str:
+    """Return the JSON inside a markdown code fence, or the stripped text if unfenced."""
+    text = text.strip()
+    fenced = _FENCE_RE.match(text)
+    return fenced.group(1) if fenced else text
+
+
+def loads_json(data):
+    """Parse JSON with orjson, falling back to the more lenient stdlib parser
+    (which also accepts NaN/Infinity literals)."""
+    try:
+        return orjson.loads(data)
+    except orjson.JSONDecodeError:
+        return json.loads(data)
@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+"""
+LLM Prompt Helpers Module
+Text shaping shared by the prompts sent to Gemini.
+"""
+
+
+def truncate_middle(text: str, max_chars: int) -> str:
+    """
+    Cap text at max_chars, keeping its head and tail around a marker.
+
+    Three quarters of the budget go to the head; the tail is kept because
+    job postings and CVs often end with requirements or skills sections.
+    """
+    if len(text) <= max_chars:
+        return text
+    head = max_chars * 3 // 4
+    tail = max_chars - head
+    return (
+        f"{text[:head]}\n... [truncated {len(text) - max_chars} chars] ...\n"
+        f"{text[len(text) - tail:]}"
+    )
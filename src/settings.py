@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Settings Module
+Reads environment configuration once and exposes it as an immutable object.
+"""
+
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional, Tuple
+
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+
+@dataclass(frozen=True)
+class Settings:
+    project_id: Optional[str]
+    location: str
+    scrape_ttl: float
+    max_desc_chars: int
+    feedback_locations: Tuple[str, ...]
+
+
+def _parse_locations(value: Optional[str], default: str) -> Tuple[str, ...]:
+    """Split a comma-separated location list, falling back to a single default."""
+    locations = tuple(loc.strip() for loc in (value or "").split(",") if loc.strip())
+    return locations or (default,)
+
+
+@lru_cache(maxsize=None)
+def get_settings() -> Settings:
+    """Return the process-wide settings, reading the environment on first use."""
+    return Settings(
+        project_id=os.getenv("GOOGLE_CLOUD_PROJECT"),
+        location=os.getenv("GOOGLE_CLOUD_LOCATION", "us-central1"),
+        # Seconds a scraped job description stays valid in the on-disk cache
+        scrape_ttl=float(os.getenv("GLOBALAI_SCRAPE_TTL", "86400")),
+        # Maximum job description length (characters) sent to the LLM
+        max_desc_chars=int(os.getenv("GLOBALAI_MAX_DESC_CHARS", "6000")),
+        # Vertex AI regions feedback requests are spread across (comma-separated);
+        # defaults to the primary location only
+        feedback_locations=_parse_locations(
+            os.getenv("GLOBALAI_FEEDBACK_LOCATIONS"),
+            os.getenv("GOOGLE_CLOUD_LOCATION", "us-central1"),
+        ),
+    )